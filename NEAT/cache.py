@@ -0,0 +1,68 @@
+from __future__ import annotations
+from typing import Hashable
+
+from collections import OrderedDict
+
+
+class EvaluationCache:
+    '''Remembers the statistics of finished evaluations, so identical genomes evaluated
+    on the same seed with the same settings are not simulated again.
+    The least recently used evaluations are forgotten once the cache is full.
+    Each generation is evaluated on a new seed, so the cache only finds identical players of the same generation
+    :param capacity: the maximum number of evaluations to remember, 0 disables the cache
+    '''
+
+    __slots__ = ('__capacity', '__results', '__hits', '__misses')
+
+    def __init__(self, capacity: int) -> None:
+        self.__capacity = capacity
+        self.__results: OrderedDict[Hashable, dict] = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get(self, key: Hashable) -> dict:
+        '''Returns the statistics of the evaluation of the given key, None if it is not remembered
+        :param key: the genome hash, the seed and the settings of the evaluation
+        '''
+
+        stats = self.__results.get(key)
+        if stats is None:
+            self.__misses += 1
+            return None
+
+        self.__results.move_to_end(key)
+        self.__hits += 1
+        return stats
+
+    def put(self, key: Hashable, stats: dict) -> None:
+        '''Remembers the statistics of a finished evaluation
+        :param key: the genome hash, the seed and the settings of the evaluation
+        :param stats: the statistics of the evaluation
+        '''
+
+        if self.__capacity <= 0:
+            return
+
+        self.__results[key] = stats
+        self.__results.move_to_end(key)
+        if len(self.__results) > self.__capacity:
+            self.__results.popitem(last=False)
+
+    def clear(self) -> None:
+        '''Forgets every evaluation'''
+        self.__results.clear()
+
+    def __len__(self) -> int:
+        return len(self.__results)
+
+    @property
+    def enabled(self) -> bool:
+        return self.__capacity > 0
+
+    @property
+    def hits(self) -> int:
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        return self.__misses
@@ -16,11 +16,13 @@ class ConnectionGene:
     :innovation_number: the innovation number for the gene
     '''
 
+    __slots__ = ('__from_node', '__to_node', '__weight', 'enabled', '__innovation_number')
+
     def __init__(self, from_node: Node, to_node: Node, weight: float, innovation_number: int) -> None:
         self.__from_node = from_node
         self.__to_node = to_node
         self.__weight = weight
-        self.__enabled = True
+        self.enabled = True
         self.__innovation_number = innovation_number # Unique number used to compare gemomes
 
     def mutate_weight(self) -> None:
@@ -46,7 +48,7 @@ class ConnectionGene:
         '''
 
         clone = ConnectionGene(from_node, to_node, self.__weight, self.__innovation_number)
-        clone.enabled = self.__enabled
+        clone.enabled = self.enabled
         return clone
 
     def to_json(self) -> dict:
@@ -56,7 +58,7 @@ class ConnectionGene:
             'to_node': self.__to_node.number,
             'weight': self.__weight,
             'innovation_number': self.__innovation_number,
-            'enabled': self.__enabled,
+            'enabled': self.enabled,
         }
 
     @classmethod
@@ -84,14 +86,6 @@ class ConnectionGene:
     def weight(self) -> float:
         return self.__weight
 
-    @property
-    def enabled(self) -> bool:
-        return self.__enabled
-
     @property
     def innovation_number(self) -> int:
         return self.__innovation_number
-    
-    @enabled.setter
-    def enabled(self, enabled: bool) -> None:
-        self.__enabled = enabled
\ No newline at end of file
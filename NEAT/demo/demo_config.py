@@ -15,7 +15,7 @@ class DemoConfigScreen(Screen):
         self.__outputs_box = TextBox(self, self.width - 180, 575, 50, 50)
         self.__button = Button(self, 50, self.height - 130, 250, 100, (255, 255, 255), 'Continue')
 
-        self.__back_image = Image('assets/sprites/back.png')
+        self.__back_image = Image.load('assets/sprites/back.png')
 
     def draw(self) -> None:
         '''Updates graphics'''
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from NEAT.genome import Genome
+from NEAT.innovation import InnovationHistory
 from NEAT.node import Node
 
 
@@ -9,7 +10,7 @@ class DemoModel:
     def __init__(self) -> None:
         self.__default_network: Genome = None
         self.__networks: list[Genome] = []
-        self.__innovation_history = []
+        self.__innovation_history = InnovationHistory()
         self.__index = 0
 
         self.__crossed = False
@@ -28,8 +29,7 @@ class DemoModel:
 
     def mutate_weights(self) -> None:
         '''Mutates weights randomly in active genome'''
-        for gene in self.network.genes:
-            gene.mutate_weight()
+        self.network.mutate_weights()
 
     def add_connection(self) -> None:
         '''Adds a random gene connection in active genome'''
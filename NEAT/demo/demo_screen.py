@@ -6,7 +6,8 @@ from NEAT.demo.demo_controller import DemoController
 from NEAT.genome import Genome
 from NEAT.node import Node
 
-import numpy as np
+import pygame as pg
+import math
 
 
 class DemoScreen(Screen):
@@ -15,10 +16,16 @@ class DemoScreen(Screen):
     def __init__(self) -> None:
         super().__init__(Constants.WINDOW_WIDTH, Constants.WINDOW_HEIGHT, 'NEAT Demo')
         self.__controller = DemoController()
-        self.__back_image = Image('assets/sprites/back.png')
+        self.__back_image = Image.load('assets/sprites/back.png')
 
-        self.__title_font = self.load_font('assets/fonts/HyperSpaceBold.ttf', 60)
-        self.__button_font = self.load_font('assets/fonts/HyperSpaceBold.ttf', 20)
+        # Cached drawing of the displayed network
+        self.__network: Genome = None
+        self.__network_key: tuple = None
+        self.__network_surface: pg.Surface = None
+        self.__network_padding = 0
+
+        self.__title_font = self.load_font('assets/fonts/HyperspaceBold.ttf', 60)
+        self.__button_font = self.load_font('assets/fonts/HyperspaceBold.ttf', 20)
 
         self.__node_button = Button(self, 30, 350, 200, 80, (255, 255, 255), 'Add Node')
         self.__connection_button = Button(self, 30, self.height - 125, 200, 80, (255, 255, 255), 'Add Connection')
@@ -55,7 +62,8 @@ class DemoScreen(Screen):
         self.image(self.__back_image, 10, 10, 65, 65)
 
     def draw_network(self, network: Genome, x: float, y: float, w: float, h: float, r: float) -> None:
-        '''Draws a neural network on the screen
+        '''Draws a neural network on the screen.
+        The drawing is rendered off-screen once and redrawn only when the genome changes
         :param network: genome of the network
         :param x: X coordinate for the top left corner of the drawing
         :param y: Y coordinate for the top left corner of the drawing
@@ -64,19 +72,43 @@ class DemoScreen(Screen):
         :param r: radius for neurons in the drawing
         '''
 
-        nodes_by_layers: list[list[Node]] = []
-        node_poses: list[tuple[int, int]] = []
-        node_numbers: list[int] = []
+        key = (network.version, w, h, r)
+        if network is not self.__network or key != self.__network_key:
+            self.__network = network
+            self.__network_key = key
+
+            # The neurons and their labels reach past the edges of the drawing, so the surface is padded to fit them
+            self.font_size(50)
+            label = max((max(self.text_size(str(node.number + 1))) for node in network.nodes), default=0)
+            self.__network_padding = math.ceil(r + label)
+            self.__network_surface = pg.Surface((w + self.__network_padding * 2, h + self.__network_padding * 2), pg.SRCALPHA)
+
+            self.begin_draw(self.__network_surface)
+            self.render_network(network, self.__network_padding, self.__network_padding, w, h, r)
+            self.end_draw()
 
-        for layer in range(network.layers):
-            nodes_by_layers.append(list(filter(lambda node: node.layer == layer, network.nodes)))
+        self.blit(self.__network_surface, x - self.__network_padding, y - self.__network_padding)
 
-        for layer in range(network.layers):
+    def render_network(self, network: Genome, x: float, y: float, w: float, h: float, r: float) -> None:
+        '''Draws a neural network on the current drawing surface
+        :param network: genome of the network
+        :param x: X coordinate for the top left corner of the drawing
+        :param y: Y coordinate for the top left corner of the drawing
+        :param w: maximum width of the drawing
+        :param h: maximum height of the drawing
+        :param r: radius for neurons in the drawing
+        '''
+
+        nodes_by_layers: list[list[Node]] = [[] for _ in range(network.layers)]
+        node_poses: dict[int, tuple[float, float]] = {}
+
+        for node in network.nodes:
+            nodes_by_layers[node.layer].append(node)
+
+        for layer, nodes in enumerate(nodes_by_layers):
             node_x = x + ((layer + 1) * w) / (network.layers + 1)
-            for i, node in enumerate(nodes_by_layers[layer]):
-                node_y = y + ((i + 1) * h) / (len(nodes_by_layers[layer]) + 1)
-                node_poses.append((node_x, node_y))
-                node_numbers.append(node.number)
+            for i, node in enumerate(nodes):
+                node_poses[node.number] = (node_x, y + ((i + 1) * h) / (len(nodes) + 1))
 
         for gene in network.genes:
             if gene.enabled:
@@ -85,20 +117,17 @@ class DemoScreen(Screen):
                 else: 
                     self.fill(0, 0, 255)
 
-                weight = int(np.interp(abs(gene.weight), [0, 1], [1, 5]))
-
-                from_pos = node_poses[node_numbers.index(gene.from_node.number)]
-                to_pos = node_poses[node_numbers.index(gene.to_node.number)]
-                self.line(*from_pos, *to_pos, weight)
+                # Map weights from 0 - 1 to line widths of 1 - 5
+                weight = int(1 + 4 * min(abs(gene.weight), 1))
+                self.line(*node_poses[gene.from_node.number], *node_poses[gene.to_node.number], weight)
 
         self.stroke(0)
         self.stroke_weight(1)
         self.font_size(20)
-        for pos, num in zip(node_poses, node_numbers):
-           
+        for num, pos in node_poses.items():
             self.fill(255)
             self.stroke_weight(3)
-            if num == self.__controller.network.bias_node:
+            if num == network.bias_node:
                 self.stroke(0, 255, 0)
             else: self.stroke(0)
             self.circle(*pos, r)
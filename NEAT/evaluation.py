@@ -0,0 +1,101 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from NEAT.genome import Genome
+
+from abc import ABC, abstractmethod
+
+
+class Evaluation(ABC):
+    '''The environment a single genome is evaluated in.
+    The population and its species only use the methods and properties of this class,
+    so the NEAT core does not depend on the game. Simulation implements it for the asteroids game,
+    an implementation missing any of them cannot be created
+    '''
+
+    @abstractmethod
+    def update(self, iterations: int = 1) -> None:
+        '''Advances the evaluation
+        :param iterations: the number of iterations to update by
+        '''
+
+    @abstractmethod
+    def reset(self) -> None:
+        '''Starts the evaluation over with the same brain'''
+
+    @abstractmethod
+    def restore(self, stats: dict) -> None:
+        '''Ends the evaluation with the statistics of an identical evaluation, without running it
+        :param stats: the statistics of the identical evaluation
+        '''
+
+    @abstractmethod
+    def calculate_fitness(self) -> None:
+        '''Calculates the fitness of the brain from the finished evaluation'''
+
+    @abstractmethod
+    def crossover(self, parent2: Evaluation) -> Evaluation:
+        '''Returns a new evaluation with the crossover of both brains,
+        while this parent is the fittest
+        :param parent2: the other parent to crossover with
+        '''
+
+    @abstractmethod
+    def clone(self) -> Evaluation:
+        '''Returns a new evaluation with a copy of this brain, score and fitness'''
+
+    @property
+    @abstractmethod
+    def brain(self) -> Genome:
+        ...
+
+    @property
+    @abstractmethod
+    def dead(self) -> bool:
+        ...
+
+    @property
+    @abstractmethod
+    def score(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def fitness(self) -> float:
+        ...
+
+    @property
+    @abstractmethod
+    def seed(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+    @property
+    @abstractmethod
+    def config(self) -> tuple:
+        ...
+
+    @brain.setter
+    @abstractmethod
+    def brain(self, brain: Genome) -> None:
+        ...
+
+    @score.setter
+    @abstractmethod
+    def score(self, score: int) -> None:
+        ...
+
+    @fitness.setter
+    @abstractmethod
+    def fitness(self, fitness: float) -> None:
+        ...
+
+    @seed.setter
+    @abstractmethod
+    def seed(self, seed: int) -> None:
+        ...
@@ -1,10 +1,14 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from NEAT.innovation import InnovationHistory
 
-from NEAT.connection_history import ConnectionHistory
 from NEAT.connection_gene import ConnectionGene
 from NEAT.node import Node
-from NEAT.innovation import Innovation
+from utils.constants import Constants
 
+import hashlib
 import random
 import json
 
@@ -24,6 +28,7 @@ class Genome:
         self.__outputs = outputs
         self.__layers = 2
         self.__next_node = 0
+        self.__version = 0 # Incremented whenever the structure or the weights change
 
         self.__genes: list[ConnectionGene] = []
         self.__nodes: list[Node] = []
@@ -82,6 +87,8 @@ class Genome:
         This allows each node to access its next node during feed forward
         '''
         
+        self.__version += 1
+
         # Clear all existing connections
         for node in self.__nodes:
             node.output_connections = []
@@ -131,9 +138,9 @@ class Genome:
                 if (node.layer == layer):
                     self.__phenotype.append(node)
 
-    def add_node(self, innovation_history: list[ConnectionHistory]) -> None:
+    def add_node(self, innovation_history: InnovationHistory) -> None:
         '''Mutates the neural network by adding a new node between two random nodes
-        :param innovation_history: global list of all previous mutations
+        :param innovation_history: record of all previous mutations
         '''
 
         # If nothing is connected add a new connection instead
@@ -156,21 +163,25 @@ class Genome:
         self.__nodes.append(new_node)
         self.__next_node += 1
 
+        # The new connections are numbered together, as a single mutation of this genome
+        connect_bias = random_connection.from_node != self.__nodes[self.__bias_node]
+        connections = [(random_connection.from_node, new_node), (new_node, random_connection.to_node)]
+        if connect_bias:
+            connections.append((self.__nodes[self.__bias_node], new_node))
+        innovation_numbers = self.get_innovation_numbers(innovation_history, connections)
+
         # Add the connection to the new node with a weight of 1
-        innovation_number = self.get_innovation_number(innovation_history, random_connection.from_node, new_node)
-        self.__genes.append(ConnectionGene(random_connection.from_node, new_node, 1, innovation_number))
+        self.__genes.append(ConnectionGene(random_connection.from_node, new_node, 1, innovation_numbers[0]))
 
         # Add the connection from the node with the original connection's weight
-        innovation_number = self.get_innovation_number(innovation_history, new_node, random_connection.to_node)
-        self.__genes.append(ConnectionGene(new_node, random_connection.to_node, random_connection.weight, innovation_number))
+        self.__genes.append(ConnectionGene(new_node, random_connection.to_node, random_connection.weight, innovation_numbers[1]))
 
         # New node's layer is one past the origin node's layer
         new_node.layer = random_connection.from_node.layer + 1
 
         # Connect new node to bias with a weight of 0, if it's not already connected
-        if random_connection.from_node != self.__nodes[self.__bias_node]:
-            innovation_number = self.get_innovation_number(innovation_history, self.__nodes[self.__bias_node], new_node)
-            self.__genes.append(ConnectionGene(self.__nodes[self.__bias_node], new_node, 0, innovation_number))
+        if connect_bias:
+            self.__genes.append(ConnectionGene(self.__nodes[self.__bias_node], new_node, 0, innovation_numbers[2]))
         
         # If the new node's layer is the same as the original connection's out node's layer
         # incriment all layers starting from the new node's layer
@@ -185,9 +196,9 @@ class Genome:
         # Finally reconnect all nodes
         self.connect_nodes()
 
-    def add_connection(self, innovation_history: list[ConnectionHistory]) -> None:
+    def add_connection(self, innovation_history: InnovationHistory) -> None:
         '''Mutates the neural network by connecting two random nodes
-        :param innovation_history: global list of all previous mutations
+        :param innovation_history: record of all previous mutations
         '''
 
         # Cannot add a connection to a fully connected network
@@ -208,41 +219,26 @@ class Genome:
             n1, n2 = n2, n1
 
         # Add the connection
-        innovation_number = self.get_innovation_number(innovation_history, n1, n2)
+        innovation_number = self.get_innovation_numbers(innovation_history, [(n1, n2)])[0]
         self.__genes.append(ConnectionGene(n1, n2, random.uniform(-1, 1), innovation_number))
 
         # Connect nodes
         self.connect_nodes()
 
-    def get_innovation_number(self, innovation_history: list[ConnectionHistory], from_node: Node, to_node: Node) -> int:
-        '''Returns the innovation number for the new mutation.
-        If the mutation has never occured before then a new 
-        unique innovation number will be given. However, if
+    def get_innovation_numbers(self, innovation_history: InnovationHistory, connections: list[tuple[Node, Node]]) -> list[int]:
+        '''Returns the innovation numbers for the new connections of a mutation.
+        If the mutation has never occured before then new 
+        unique innovation numbers will be given. However, if
         the mutation matches a previous mutation then it will
-        be given the same innovation number as the previous one's
-        :param innovation_history: global list of all previous mutations
-        :from_node: the start node of the gene
-        :to_node: the target node of the gene
+        be given the same innovation numbers as the previous one's.
+        Mutations match when the connections are between the same nodes
+        and the genomes had the same genes before the mutation
+        :param innovation_history: record of all previous mutations
+        :param connections: the start node and the target node of each new gene
         '''
 
-        is_new = True
-        innovation_number = Innovation.next_innovation_number
-
-        for history in innovation_history:
-            if history.matches(self, from_node, to_node):
-                # If a match was found, then it's not a new mutation   
-                is_new = False
-                # Set the innovation number to the innovation number of the match
-                innovation_number = history.innovation_number
-                break # Stop searching for a match
-
-        if is_new:
-            # If it is a new mutation, add it to the innovation history list
-            prior_innovations = [gene.innovation_number for gene in self.__genes]
-            innovation_history.append(ConnectionHistory(from_node.number, to_node, innovation_number, prior_innovations))
-            Innovation.next_innovation_number += 1
-
-        return innovation_number
+        context = frozenset(gene.innovation_number for gene in self.__genes)
+        return innovation_history.reserve([(from_node.number, to_node.number, context) for from_node, to_node in connections])
     
     def fully_connected(self) -> bool:
         '''Returns whether the neural network is fully connected'''
@@ -264,12 +260,12 @@ class Genome:
 
         return max_connections == len(self.__genes)
         
-    def mutate(self, innovation_history: list[ConnectionHistory]) -> None:
-        '''Mutates the genome in one or more of the three options:
-        - Mutate weights (80% chance)
-        - Add a new connection (5% chance)
-        - Add a new node (3% chance)
-        :param innovation_history: global list of all previous mutations
+    def mutate(self, innovation_history: InnovationHistory) -> None:
+        '''Mutates the genome in one or more of the three options, with the chances set in Constants:
+        - Mutate weights (80% chance by default)
+        - Add a new connection (5% chance by default)
+        - Add a new node (3% chance by default)
+        :param innovation_history: record of all previous mutations
         '''
 
         # Add a new connection for first mutation
@@ -277,18 +273,25 @@ class Genome:
             self.add_connection(innovation_history)
 
         # 80% chance of mutating weights
-        if random.random() < 0.8:
-            for gene in self.genes:
-                gene.mutate_weight()
+        if random.random() < Constants.WEIGHT_MUTATION_CHANCE:
+            self.mutate_weights()
 
         # 5% chance of adding a new connection
-        if random.random() < 0.05:
+        if random.random() < Constants.CONNECTION_MUTATION_CHANCE:
             self.add_connection(innovation_history)
 
         # 3% chance of adding a new node
-        if random.random() < 0.03:
+        if random.random() < Constants.NODE_MUTATION_CHANCE:
             self.add_node(innovation_history)
 
+    def mutate_weights(self) -> None:
+        '''Mutates the weight of every gene in the genome'''
+
+        for gene in self.__genes:
+            gene.mutate_weight()
+
+        self.__version += 1
+
     def matching_gene_index(self, innovation_number: int) -> int:
         '''Returns the index of the gene matching the given innovation number,
         Returns -1 if no gene was found
@@ -379,6 +382,18 @@ class Genome:
         clone.connect_nodes()
         return clone
     
+    def get_hash(self) -> str:
+        '''Returns a hash of the structure and the weights of this genome.
+        Genomes with the same hash compute exactly the same outputs,
+        as their nodes and genes are engaged in the same order
+        '''
+
+        nodes = tuple((node.number, node.layer) for node in self.__nodes)
+        genes = tuple((gene.innovation_number, gene.from_node.number, gene.to_node.number, gene.weight, gene.enabled)
+                      for gene in self.__genes)
+        canonical = repr((self.__inputs, self.__outputs, self.__bias_node, nodes, genes))
+        return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
     def to_json(self) -> dict:
         '''Returns a dictionary containing useful information, used for storing the genome in a file'''
         return {
@@ -406,18 +421,24 @@ class Genome:
         '''
         
         with open(filename, 'r') as f:
-            data = json.load(f)
+            return cls.from_json(json.load(f))
+
+    @classmethod
+    def from_json(cls, data: dict) -> Genome:
+        '''Builds a new Genome from a dictionary in the format of to_json
+        :param data: the data of the genome
+        '''
 
-            genome = cls(data['inputs'], data['outputs'])
-            genome.nodes = [Node.load(node) for node in data['nodes']]
-            genome.genes = [ConnectionGene.load(genome, gene) for gene in data['genes']]
+        genome = cls(data['inputs'], data['outputs'], crossover=True)
+        genome.nodes = [Node.load(node) for node in data['nodes']]
+        genome.genes = [ConnectionGene.load(genome, gene) for gene in data['genes']]
 
-            genome.layers = data['layers']
-            genome.next_node = data['next_node']
-            genome.bias_node = data['bias_node']
+        genome.layers = data['layers']
+        genome.next_node = data['next_node']
+        genome.bias_node = data['bias_node']
 
-            genome.generate_phenotype()
-            return genome
+        genome.generate_phenotype()
+        return genome
 
     
     @property
@@ -428,6 +449,14 @@ class Genome:
     def nodes(self) -> list[Node]:
         return self.__nodes
         
+    @property
+    def inputs(self) -> int:
+        return self.__inputs
+
+    @property
+    def outputs(self) -> int:
+        return self.__outputs
+
     @property
     def layers(self) -> int:
         return self.__layers
@@ -440,6 +469,10 @@ class Genome:
     def bias_node(self) -> int:
         return self.__bias_node
 
+    @property
+    def version(self) -> int:
+        return self.__version
+
     @layers.setter
     def layers(self, layers: int) -> None:
         self.__layers = layers
@@ -1,4 +1,110 @@
-class Innovation:
-    '''Global innovation number for future genes.
-    Starts with 1000 to prevent clashing with local innovation numbers.'''
-    next_innovation_number = 1000
\ No newline at end of file
+from __future__ import annotations
+
+from multiprocessing.managers import BaseManager
+import multiprocessing as mp
+import threading
+
+
+class InnovationHistory:
+    '''Record of every structural mutation and its innovation number,
+    used to determine if a certain mutation is innovative or not.
+    A mutation is a new gene between two nodes in a genome with a certain context (the innovation numbers of its genes),
+    identical mutations of identical genomes are given the same innovation number.
+    Numbers are reserved in the order of the requests, so the same requests always get the same numbers
+    :param next_innovation_number: the first new innovation number,
+    starts with 1000 to prevent clashing with local innovation numbers
+    '''
+
+    def __init__(self, next_innovation_number: int = 1000) -> None:
+        self.__next_innovation_number = next_innovation_number
+        self.__numbers: dict[tuple[int, int, frozenset[int]], int] = {}
+        self.__lock = threading.Lock() # Served histories are used by several threads of the manager
+
+    def reserve(self, mutations: list[tuple[int, int, frozenset[int]]],
+                provisional: list[tuple[int, int]] = None) -> list[int]:
+        '''Returns the innovation number of each mutation, reserving a new number for new mutations
+        :param mutations: the start node number, the target node number and the context of each mutation
+        :param provisional: the group and the provisional number of each mutation, for mutations numbered by
+        a copy of the history. The provisional numbers in the context of a mutation are replaced
+        by the numbers reserved for earlier mutations of the same group, so a whole batch is a single request
+        '''
+
+        with self.__lock:
+            numbers: list[int] = []
+            reserved: dict[tuple[int, int], int] = {} # Reserved number of each provisional number
+            for i, (from_number, to_number, context) in enumerate(mutations):
+                if provisional is not None:
+                    group = provisional[i][0]
+                    context = frozenset(reserved.get((group, number), number) for number in context)
+
+                mutation = (from_number, to_number, context)
+                number = self.__numbers.get(mutation)
+                if number is None: # A new mutation
+                    number = self.__numbers[mutation] = self.__next_innovation_number
+                    self.__next_innovation_number += 1
+                numbers.append(number)
+
+                if provisional is not None:
+                    reserved[provisional[i]] = number
+
+            return numbers
+
+    def mutations(self, start: int = 0) -> list[tuple[tuple[int, int, frozenset[int]], int]]:
+        '''Returns the mutations and their innovation numbers in the order they were found
+        :param start: the number of mutations to skip
+        '''
+
+        with self.__lock:
+            return list(self.__numbers.items())[start:]
+
+    def copy(self) -> InnovationHistory:
+        '''Returns a copy of this history, which numbers new mutations on its own'''
+
+        with self.__lock:
+            copy = InnovationHistory(self.__next_innovation_number)
+            copy.__numbers = self.__numbers.copy()
+            return copy
+
+    def __len__(self) -> int:
+        return len(self.__numbers)
+
+    def __getstate__(self) -> dict:
+        # Locks cannot be pickled, a copy sent to another process gets its own lock
+        return {'next_innovation_number': self.__next_innovation_number, 'numbers': self.__numbers}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__next_innovation_number = state['next_innovation_number']
+        self.__numbers = state['numbers']
+        self.__lock = threading.Lock()
+
+    @property
+    def next_innovation_number(self) -> int:
+        return self.__next_innovation_number
+
+
+class InnovationManager(BaseManager):
+    '''Manager process serving innovation histories to local worker processes'''
+
+
+InnovationManager.register('InnovationHistory', InnovationHistory, exposed=('reserve', 'mutations', 'copy', '__len__'))
+
+
+class InnovationService:
+    '''A central innovation history, shared by several processes.
+    The history lives in a manager process, the proxy returned by history can be sent to worker processes,
+    each call to reserve is a single request handled as a whole
+    :param next_innovation_number: the first new innovation number
+    '''
+
+    def __init__(self, next_innovation_number: int = 1000) -> None:
+        self.__manager = InnovationManager(ctx=mp.get_context('spawn'))
+        self.__manager.start()
+        self.__history: InnovationHistory = self.__manager.InnovationHistory(next_innovation_number)
+
+    def close(self) -> None:
+        '''Stops the manager process'''
+        self.__manager.shutdown()
+
+    @property
+    def history(self) -> InnovationHistory:
+        return self.__history
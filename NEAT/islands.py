@@ -0,0 +1,177 @@
+from __future__ import annotations
+from typing import Iterator
+
+from NEAT.genome import Genome
+from NEAT.innovation import InnovationHistory, InnovationService
+from NEAT.population import Population
+from utils.geometry.collision import SpriteDimensions
+from utils.constants import Constants
+
+import multiprocessing as mp
+import queue
+
+
+class IslandModel:
+    '''Evolves several populations (islands) in separate processes.
+    Every few generations each island sends the champions of its best species to the islands it is connected to,
+    and takes in the champions that have arrived without waiting for slower islands.
+    All islands share one innovation history, so the genes of migrants match the genes of their new population
+    :param islands: the number of islands
+    :param population_size: size of each island's population
+    :param interval: the number of generations between migrations
+    :param migrants: the number of champions each island sends to every island it is connected to
+    :param topology: 'ring' to send to the next island, 'all' to send to every other island
+    :param seed: the seed of the first island, the other islands use the next seeds. None draws the seeds randomly
+    '''
+
+    def __init__(self, islands: int = Constants.ISLANDS, population_size: int = Constants.POPULATION_SIZE,
+                 interval: int = Constants.MIGRATION_INTERVAL, migrants: int = Constants.MIGRANTS,
+                 topology: str = Constants.MIGRATION_TOPOLOGY, seed: int = None) -> None:
+
+        if topology not in ('ring', 'all'):
+            raise ValueError(f'Unknown migration topology: {topology}')
+
+        self.__islands = islands
+        self.__population_size = population_size
+        self.__interval = interval
+        self.__migrants = migrants
+        self.__topology = topology
+        self.__seed = seed
+
+        self.__service: InnovationService = None
+        self.__processes: list[mp.Process] = []
+        self.__results: mp.Queue = None
+        self.__inboxes: list[mp.Queue] = [] # Kept alive untill every island has started
+
+    def neighbours(self, index: int) -> list[int]:
+        '''Returns the islands the given island sends its migrants to
+        :param index: the index of the island
+        '''
+
+        if self.__topology == 'ring':
+            return [(index + 1) % self.__islands] if self.__islands > 1 else []
+        return [i for i in range(self.__islands) if i != index]
+
+    def start(self, generations: int) -> None:
+        '''Starts evolving every island in the background
+        :param generations: the number of generations each island evolves
+        '''
+
+        # Spawn fresh interpreters, the islands do not need the parent's pygame state
+        context = mp.get_context('spawn')
+        self.__service = InnovationService()
+        self.__results = context.Queue()
+
+        self.__inboxes = [context.Queue() for _ in range(self.__islands)]
+        inbound = [sum(index in self.neighbours(i) for i in range(self.__islands)) for index in range(self.__islands)]
+
+        # The sprite dimensions are loaded by the game screen, which the islands do not have
+        for index in range(self.__islands):
+            seed = None if self.__seed is None else self.__seed + index
+            self.__processes.append(context.Process(
+                target=IslandModel.run,
+                args=(index, self.__population_size, seed, generations, dict(SpriteDimensions.dimensions),
+                      self.__service.history, self.__interval, self.__migrants * inbound[index],
+                      self.__inboxes[index], [self.__inboxes[i] for i in self.neighbours(index)],
+                      self.__migrants, self.__results)))
+
+        for process in self.__processes:
+            process.start()
+
+    def results(self) -> Iterator[tuple[int, int, int, int]]:
+        '''Yields the index, generation, best score and number of species of an island after each of its generations,
+        in the order they are finished. Stops the islands once every island is done
+        :raises RuntimeError: an island process stopped without finishing, the other islands are stopped
+        '''
+
+        running = set(range(self.__islands))
+        while running:
+            try:
+                result = self.__results.get(timeout=1)
+            except queue.Empty:
+                # An island which crashed never reports that it is done.
+                # Islands flush their results before exiting, so only islands without results left are checked
+                crashed = [index for index in running if not self.__processes[index].is_alive()]
+                if crashed and self.__results.empty():
+                    self.terminate()
+                    raise RuntimeError(f'Island {crashed[0]} stopped unexpectedly')
+                continue
+
+            index, generation = result[:2]
+            if generation is None: # The island is done
+                running.remove(index)
+            else:
+                yield result
+
+        self.join()
+
+    def terminate(self) -> None:
+        '''Stops every island immediately and stops the innovation service'''
+
+        for process in self.__processes:
+            if process.is_alive():
+                process.terminate()
+        self.join()
+
+    def join(self) -> None:
+        '''Waits for every island to finish and stops the innovation service'''
+
+        for process in self.__processes:
+            process.join()
+        self.__processes = []
+        self.__inboxes = []
+
+        if self.__service is not None:
+            self.__service.close()
+            self.__service = None
+
+    @staticmethod
+    def run(index: int, population_size: int, seed: int, generations: int, dimensions: dict[str, list[tuple[int, int]]],
+            innovation_history: InnovationHistory, interval: int, capacity: int,
+            inbox: mp.Queue, outboxes: list[mp.Queue], migrants: int, results: mp.Queue) -> None:
+        '''Entry point of an island process
+        :param index: the index of the island
+        :param population_size: size of the island's population
+        :param seed: the seed of the island's population
+        :param generations: the number of generations to evolve
+        :param dimensions: the dimensions of each sprite in the game
+        :param innovation_history: the shared innovation history
+        :param interval: the number of generations between migrations
+        :param capacity: the maximum number of migrants taken in on each migration
+        :param inbox: queue of migrants sent to this island
+        :param outboxes: queues of the islands this island sends its migrants to
+        :param migrants: the number of champions sent to each connected island
+        :param results: queue of the results of each generation
+        '''
+
+        SpriteDimensions.dimensions.update(dimensions)
+
+        # Islands which are already done do not read their migrants, sending to them must not block exiting
+        for outbox in outboxes:
+            outbox.cancel_join_thread()
+
+        population = Population(population_size, seed=seed, innovation_history=innovation_history)
+
+        for _ in range(generations):
+            while not population.done():
+                population.update(iterations=Constants.ITERATIONS)
+            population.natural_selection()
+
+            if population.generation % interval == 0:
+                champions = [brain.to_json() for brain in population.emigrants(migrants)]
+                for outbox in outboxes:
+                    outbox.put(champions)
+
+                # Take in the migrants that have arrived, the newest ones if there are too many
+                arrived: list[dict] = []
+                while True:
+                    try:
+                        arrived += inbox.get_nowait()
+                    except queue.Empty:
+                        break
+                population.immigrate([Genome.from_json(data) for data in arrived[-capacity:]] if capacity else [])
+
+            results.put((index, population.generation, population.best_score, len(population.species)))
+
+        population.close()
+        results.put((index, None, None, None))
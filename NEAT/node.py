@@ -10,26 +10,28 @@ class Node:
     '''Represents a neuron in the neural network
     :param number: the serial number of this node'''
 
+    __slots__ = ('__number', 'input_sum', 'output_value', 'output_connections', 'layer')
+
     def __init__(self, number: int) -> None:
 
         self.__number = number
-        self.__input_sum = 0
-        self.__output_value = 0
-        self.__output_connections: list[ConnectionGene] = []
-        self.__layer = 0
+        self.input_sum = 0
+        self.output_value = 0
+        self.output_connections: list[ConnectionGene] = []
+        self.layer = 0
 
     def engage(self) -> None:
         '''Sends its output to the inputs of the nodes it's connected to,
         used in the feedforward process
         '''
 
-        if self.__layer != 0: # No activation for inputs and bias
-            self.__output_value = Node.sigmoid(self.__input_sum)
+        if self.layer != 0: # No activation for inputs and bias
+            self.output_value = Node.sigmoid(self.input_sum)
             
         # For each connection, add the weighted output to the sum of inputs of the connected node
-        for connection in self.__output_connections:
+        for connection in self.output_connections:
             if connection.enabled:
-                connection.to_node.input_sum += connection.weight * self.__output_value
+                connection.to_node.input_sum += connection.weight * self.output_value
 
     @staticmethod
     @lru_cache(maxsize=10000)
@@ -45,26 +47,26 @@ class Node:
         '''
 
         # Nodes in the same layer cannot be connected
-        if node.layer == self.__layer:
+        if node.layer == self.layer:
             return False
 
         if node.layer < self.layer: # The other node connects to this node
             if any(connection.to_node == self for connection in node.output_connections):
                 return True
         else: # This node connects to the other node
-            return any(connection.to_node == node for connection in self.__output_connections)
+            return any(connection.to_node == node for connection in self.output_connections)
 
     def clone(self) -> Node:
         '''Returns a copy of this node'''
         clone = Node(self.__number)
-        clone.layer = self.__layer
+        clone.layer = self.layer
         return clone
 
     def to_json(self) -> dict:
         '''Returns a dictionary containing useful information of this node, used in storing the node in a file'''
         return { 
             'number': self.__number,
-            'layer': self.__layer,
+            'layer': self.layer,
         }
 
     @classmethod
@@ -80,35 +82,3 @@ class Node:
     @property
     def number(self) -> int:
         return self.__number
-    
-    @property
-    def output_connections(self) -> list[ConnectionGene]:
-        return self.__output_connections
-
-    @property
-    def input_sum(self) -> float:
-        return self.__input_sum
-
-    @property
-    def layer(self) -> int:
-        return self.__layer
-
-    @property
-    def output_value(self) -> float:
-        return self.__output_value
-
-    @output_connections.setter
-    def output_connections(self, connections: list[ConnectionGene]) -> None:
-        self.__output_connections = connections
-
-    @input_sum.setter
-    def input_sum(self, input_sum: float) -> None:
-        self.__input_sum = input_sum
-
-    @layer.setter
-    def layer(self, layer: int) -> None:
-        self.__layer = layer
-
-    @output_value.setter
-    def output_value(self, output: float) -> None:
-        self.__output_value = output
\ No newline at end of file
@@ -1,38 +1,66 @@
 from utils.constants import Constants
-from NEAT.population import Population
+from NEAT.trainer import Trainer, TrainingProcess
+from NEAT.snapshot import SnapshotBuffer, Snapshot
 from NEAT.genome import Genome
 from NEAT.node import Node
 from src.screens.game import GameScreen
 
-import numpy as np
+import pygame as pg
+import math
 
 
 class PopulationScreen(GameScreen):
-    '''Graphical screen used for viewing the training process
+    '''Graphical screen used for viewing the training process.
+    The training runs in a background process, this screen only draws its snapshots
     :param population_size: size of the genetic algorithm population
     '''
 
     def __init__(self, population_size: int = Constants.POPULATION_SIZE) -> None:
         super().__init__()
 
-        self.__population = Population(population_size)
-        self.controller = self.__population.batch[0]
-        self.__index = 0
+        self.__population_size = population_size
+        self.__training: TrainingProcess = None # Background training
+        self.__trainer: Trainer = None # Training inside the render loop
+        self.__snapshots: SnapshotBuffer = None
+        self.__snapshot: Snapshot = None
+
+        # Cached drawing of the followed network
+        self.__network: Genome = None
+        self.__network_key: tuple = None
+        self.__network_surface: pg.Surface = None
+        self.__network_padding = 0
 
         self.__gen_font = self.load_font('assets/fonts/HyperspaceBold.ttf', 25)
 
-    def update(self) -> None:
-        '''Updates the controller and master game logic'''
+    def switch_reset(self) -> None:
+        '''Starts the training on the first visit and resumes it on the next visits'''
 
-        if not self.__population.done():
-            self.__population.update(iterations=Constants.ITERATIONS)
+        if Constants.BACKGROUND_TRAINING:
+            if self.__training is None:
+                self.__training = TrainingProcess(self.__population_size)
+                self.__training.start()
+            else:
+                self.__training.resume()
 
-            if self.controller.dead:
-                self.next_player()
-        else:
-            self.__population.natural_selection()
-            self.controller = self.__population.batch[0]
-            self.__index = 0
+        elif self.__trainer is None:
+            self.__trainer = Trainer(self.__population_size)
+            rays = len(self.__trainer.controller.player.ray_set)
+            self.__snapshots = SnapshotBuffer(bytearray(SnapshotBuffer.size(rays) * 8), rays)
+
+            # Train as much as fits in each frame, the drawing does not slow down the training
+            self.update_budget = Constants.SIMULATION_BUDGET
+
+    def update(self) -> None:
+        '''Advances the training when it runs inside the render loop'''
+        if self.__trainer is not None:
+            self.__trainer.step()
+
+    def next_player(self) -> None:
+        '''Follows the next alive simulation in the current batch'''
+        if self.__training is not None:
+            self.__training.next_player()
+        elif self.__trainer is not None:
+            self.__trainer.next_player()
     
     def on_key_down(self, key: int, unicode: str) -> None:
         '''handles key press events
@@ -43,11 +71,22 @@ class PopulationScreen(GameScreen):
         if key == self.keys['SPACE']:
             self.next_player()
 
+        elif key == self.keys['t']:
+            self.toggle_turbo()
+
         elif key == self.keys['ESCAPE']:
+            # Stop using the CPU while the training is not viewed
+            if self.__training is not None:
+                self.__training.pause()
             self.redirect('menu')
 
+    def toggle_turbo(self) -> None:
+        '''Toggles turbo mode, which only draws once every few frames'''
+        self.render_interval = 1 if self.turbo else Constants.TURBO_RENDER_INTERVAL
+
     def draw_network(self, network: Genome, x: float, y: float, w: float, h: float, r: float, show_labels: bool = True) -> None:
-        '''Draws the neural network on the screen
+        '''Draws the neural network on the screen.
+        The drawing is rendered off-screen once and redrawn only when the genome changes
         :param genome: the genotype of the network to draw
         :param x: the X coordinate for the top left corner of the drawing
         :param y: the Y coordinate for the top left corner of the drawing
@@ -57,19 +96,43 @@ class PopulationScreen(GameScreen):
         :param show_labels: whether or not to draw the node numbers
         '''
 
-        nodes_by_layers: list[list[Node]] = []
-        node_poses: list[tuple[int, int]] = []
-        node_numbers: list[int] = []
+        key = (network.version, w, h, r, show_labels)
+        if network is not self.__network or key != self.__network_key:
+            self.__network = network
+            self.__network_key = key
+
+            # The neurons and their labels reach past the edges of the drawing, so the surface is padded to fit them
+            label = max((max(self.text_size(str(node.number))) for node in network.nodes), default=0) if show_labels else 0
+            self.__network_padding = math.ceil(r + label)
+            self.__network_surface = pg.Surface((w + self.__network_padding * 2, h + self.__network_padding * 2), pg.SRCALPHA)
 
-        for layer in range(network.layers):
-            nodes_by_layers.append(list(filter(lambda node: node.layer == layer, network.nodes)))
+            self.begin_draw(self.__network_surface)
+            self.render_network(network, self.__network_padding, self.__network_padding, w, h, r, show_labels)
+            self.end_draw()
+
+        self.blit(self.__network_surface, x - self.__network_padding, y - self.__network_padding)
+
+    def render_network(self, network: Genome, x: float, y: float, w: float, h: float, r: float, show_labels: bool) -> None:
+        '''Draws the neural network on the current drawing surface
+        :param genome: the genotype of the network to draw
+        :param x: the X coordinate for the top left corner of the drawing
+        :param y: the Y coordinate for the top left corner of the drawing
+        :param w: the maximum width of the drawing
+        :param h: the maximum height of the drawing,
+        :param r: the radius of the neurons in the drawing
+        :param show_labels: whether or not to draw the node numbers
+        '''
 
-        for layer in range(network.layers):
+        nodes_by_layers: list[list[Node]] = [[] for _ in range(network.layers)]
+        node_poses: dict[int, tuple[float, float]] = {}
+
+        for node in network.nodes:
+            nodes_by_layers[node.layer].append(node)
+
+        for layer, nodes in enumerate(nodes_by_layers):
             node_x = x + r + (w - 2 * r) * (layer / (network.layers - 1))
-            for i, node in enumerate(nodes_by_layers[layer]):
-                node_y = y + ((i + 1) * h) / (len(nodes_by_layers[layer]) + 1)
-                node_poses.append((node_x, node_y))
-                node_numbers.append(node.number)
+            for i, node in enumerate(nodes):
+                node_poses[node.number] = (node_x, y + ((i + 1) * h) / (len(nodes) + 1))
 
         for gene in network.genes:
             if gene.enabled:
@@ -78,13 +141,11 @@ class PopulationScreen(GameScreen):
                 else: 
                     self.fill(0, 0, 255)
 
-                weight = int(np.interp(abs(gene.weight), [0, 1], [1, 5]))
-
-                from_pos = node_poses[node_numbers.index(gene.from_node.number)]
-                to_pos = node_poses[node_numbers.index(gene.to_node.number)]
-                self.line(*from_pos, *to_pos, weight)
+                # Map weights from 0 - 1 to line widths of 1 - 5
+                weight = int(1 + 4 * min(abs(gene.weight), 1))
+                self.line(*node_poses[gene.from_node.number], *node_poses[gene.to_node.number], weight)
 
-        for pos, num in zip(node_poses, node_numbers):
+        for num, pos in node_poses.items():
             self.fill(255, 255, 0)
             self.circle(*pos, r)
             if show_labels:
@@ -94,50 +155,49 @@ class PopulationScreen(GameScreen):
     def draw(self) -> None:
         '''Updates graphics'''
 
+        # Read the latest snapshot, keep the previous one if it is not ready
+        if self.__trainer is not None:
+            self.__snapshots.write(self.__trainer)
+            snapshot = self.__snapshots.read()
+        else:
+            snapshot = self.__training.snapshot()
+
+        if snapshot is not None:
+            self.__snapshot = snapshot
+
         self.draw_background()
+        self.fill(255)
+        self.set_font(self.__gen_font)
+
+        snapshot = self.__snapshot
+        if snapshot is None:
+            self.text('Starting training...', self.width * .5, self.height * .5, center=True)
+            return
 
         # AI Guidelines
-        self.draw_rays(self.controller.player.ray_set)
+        self.draw_rays(snapshot.rays)
 
         self.fill(255, 150, 150)
-        for asteroid in self.controller.asteroids:
+        for asteroid in snapshot.asteroids:
             self.draw_poly(asteroid.hitbox.rect_verts)
 
         self.fill(255)
-        self.draw_sprites(self.controller.player, self.controller.asteroids)
-        self.draw_score(self.controller.score)
-
-        if self.controller.paused:
-            self.draw_paused()
+        self.draw_sprites(snapshot.player, snapshot.asteroids)
+        self.draw_score(snapshot.score)
         
         self.fill(255)
         self.set_font(self.__gen_font)
-        self.text(f'Generation No. {self.__population.generation}', self.width - 150, 50, center=True)
-        self.text(f'Batch No. {self.__population.batch_index + 1}', self.width - 150, 100, center=True)
-        self.text(f'of {self.__population.batch_amount}', self.width - 150, 125, center=True)
-        self.text(f'Player No. {self.__index + 1}', self.width - 150, 175, center=True)
-        self.text(f'of {Constants.BATCH_SIZE}',  self.width - 150, 200, center=True)
-        self.draw_network(self.controller.brain, 0, self.height - 300, 400, 300, 5, show_labels=False)
-
-    def next_index(self) -> None:
-        '''Proceeds to next index of simulation in current batch'''
-        
-        self.__index += 1
-
-        if self.__index >= Constants.BATCH_SIZE:
-            self.__index = 0
-
-        self.controller = self.__population.batch[self.__index]
-
-    def next_player(self) -> None:
-        '''Proceeds to the next simulation in the current batch,
-        assuming that at least one player is alive
-        '''
-
-        if self.__population.current_batch_done() \
-            or len(self.__population.players) < 2:
-            return
-
-        self.next_index()
-        while self.controller.dead:
-            self.next_index()
\ No newline at end of file
+        self.text(f'Generation No. {snapshot.generation}', self.width - 150, 50, center=True)
+        self.text(f'Batch No. {snapshot.batch_index + 1}', self.width - 150, 100, center=True)
+        self.text(f'of {snapshot.batch_amount}', self.width - 150, 125, center=True)
+        self.text(f'Player No. {snapshot.index + 1}', self.width - 150, 175, center=True)
+        self.text(f'of {snapshot.batch_size}',  self.width - 150, 200, center=True)
+        if self.turbo:
+            self.text('TURBO', self.width - 150, 250, center=True)
+        if snapshot.hidden_asteroids:
+            self.text(f'+{snapshot.hidden_asteroids} asteroids not shown', self.width - 150, 300, center=True)
+        self.draw_network(snapshot.genome, 0, self.height - 300, 400, 300, 5, show_labels=False)
+
+    @property
+    def turbo(self) -> bool:
+        return self.render_interval > 1
\ No newline at end of file
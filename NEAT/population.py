@@ -1,30 +1,52 @@
 from __future__ import annotations
-from NEAT.genome import Genome
+from typing import TYPE_CHECKING, Callable
 
-from NEAT.simulation import Simulation
-from NEAT.connection_history import ConnectionHistory
+if TYPE_CHECKING:
+    from NEAT.evaluation import Evaluation
+    from NEAT.genome import Genome
+
+from NEAT.cache import EvaluationCache
+from NEAT.innovation import InnovationHistory
+from NEAT.reproduction import Reproduction
 from NEAT.species import Species
 from utils.constants import Constants
+from utils.random_state import RandomState
 
+from collections import Counter
 import math
 import os
+import random
 
 
 class Population:
     '''The population of all thinking beings (Genomes),
     Applies the genetic algorithm for each simulation
     :param size: the size of the population
+    :param evaluation: creates the evaluation of a single genome, the asteroids game Simulation by default
+    :param seed: the seed of the population's random numbers, None draws it from the random module.
+    Each population owns its random numbers and innovation history, so several populations can run side by side
+    :param innovation_history: record of all previous mutations, a new history by default.
+    Populations which exchange genomes share a history, such as the proxy of an InnovationService
     '''
 
-    def __init__(self, size: int) -> None:
+    def __init__(self, size: int, evaluation: Callable[[], Evaluation] = None, seed: int = None,
+                 innovation_history: InnovationHistory = None) -> None:
         self.__size = size
         self.__generation = 0
+        self.__random = RandomState(random.getrandbits(32) if seed is None else seed)
         
         self.__batch_amount = math.ceil(self.__size / Constants.BATCH_SIZE)
         self.__species: list[Species] = []
 
         # Record of all mutations in this population
-        self.__innovation_history: list[ConnectionHistory] = []
+        self.__innovation_history = InnovationHistory() if innovation_history is None else innovation_history
+        self.__reproduction = Reproduction(Constants.REPRODUCTION_WORKERS)
+
+        # Results of finished evaluations, identical players of a generation are only evaluated once
+        self.__cache = EvaluationCache(Constants.EVALUATION_CACHE_SIZE)
+        self.__keys: dict[int, tuple] = {} # Cache key of each active simulation, by its id
+        self.__duplicates: dict[tuple, list[Evaluation]] = {} # Players waiting on an identical active simulation
+        self.__requeued: list[Evaluation] = [] # Waiting players which have to be evaluated after all
 
         # Create file saving Directory if it does not exist
         if Constants.TRAINING:
@@ -33,18 +55,25 @@ class Population:
             if not os.path.exists('data/model'):
                 os.mkdir('data/model')
 
-        # Populate with simulations
-        self.__players = [Simulation() for _ in range(self.__size)]
-        for sim in self.__players:
-            # Start with an extra mutation for variaty
-            sim.brain.mutate(self.__innovation_history)
-            sim.brain.generate_phenotype()
+        # Only import the game when it is used
+        if evaluation is None:
+            from NEAT.simulation import Simulation
+            evaluation = Simulation
+        self.__evaluation = evaluation
 
-        self.__best_player: Simulation = self.__players[0].clone()
+        # Populate with simulations
+        with self.__random:
+            self.__players: list[Evaluation] = [evaluation() for _ in range(self.__size)]
+            for sim in self.__players:
+                # Start with an extra mutation for variaty
+                sim.brain.mutate(self.__innovation_history)
+                sim.brain.generate_phenotype()
+
+        self.__best_player: Evaluation = self.__players[0].clone()
         self.__best_score = 0
 
-        self.__batch_index = 0
-        self.__batch = self.get_current_batch()
+        self.__batch: list[Evaluation] = []
+        self.schedule()
 
         # Create/clear logs file
         if Constants.TRAINING:
@@ -56,8 +85,6 @@ class Population:
         :param iterations: the number of iterations to update by
         '''
 
-        if self.current_batch_done():
-            self.next_batch()
         self.update_current_batch(iterations=iterations)
 
     def set_best_player(self) -> None:
@@ -67,108 +94,226 @@ class Population:
             self.__best_score = best.score
             self.__best_player = best.clone()
 
-    def update_alive(self, iterations: int = 1) -> None:
-        '''Updates all alive simulations
+    def update_current_batch(self, iterations: int = 1) -> None:
+        '''Updates the active simulations, the slot of a simulation which died
+        is given to the next simulation waiting to be evaluated
         :param iterations: the number of iterations to update by
         '''
-        
-        for sim in self.__players:
-            if not sim.dead:
+
+        with self.__random:
+            for i, sim in enumerate(self.__batch):
                 sim.update(iterations=iterations)
+                if sim.dead:
+                    self.finish(sim)
+                    self.__batch[i] = self.next_player()
 
-    def update_current_batch(self, iterations: int = 1) -> None:
-        '''Updates all alive simulations in batch
-        :param iterations: the number of iterations to update by
+        # Slots without a waiting simulation are left empty at the end of the generation
+        if None in self.__batch:
+            self.__batch = [sim for sim in self.__batch if sim is not None]
+
+    def next_player(self) -> Evaluation:
+        '''Returns the next simulation waiting to be evaluated, None if every simulation has started.
+        Players identical to a finished or an active simulation are not evaluated again
         '''
 
-        for sim in self.__batch:
-            if not sim.dead:
-                sim.update(iterations=iterations)
+        while self.__requeued or self.__next_index < len(self.__players):
+            if self.__requeued:
+                sim = self.__requeued.pop(0)
+            else:
+                sim = self.__players[self.__next_index]
+                self.__next_index += 1
+
+            if not self.__cache.enabled:
+                return sim
+
+            # The seed is the generation, so only identical players of the same generation share a key
+            key = (sim.brain.get_hash(), sim.seed, sim.config)
+            stats = self.__cache.get(key)
+            if stats is not None: # Evaluated before
+                sim.restore(stats)
+                self.__dead += 1
+            elif key in self.__duplicates: # Evaluated right now
+                self.__duplicates[key].append(sim)
+            else:
+                self.__keys[id(sim)] = key
+                self.__duplicates[key] = []
+                return sim
+
+        return None
+
+    def finish(self, sim: Evaluation) -> None:
+        '''Counts a simulation which died and gives its result to the identical players waiting on it
+        :param sim: the simulation which died
+        '''
+
+        self.__dead += 1
+
+        key = self.__keys.pop(id(sim), None)
+        if key is None:
+            return
+
+        stats = sim.stats
+        duplicates = self.__duplicates.pop(key)
+
+        # Episodes cut by the wall-clock limit cannot be repeated, the identical players are evaluated on their own
+        if stats['termination'] == 'time_limit':
+            self.__requeued += duplicates
+            return
+
+        for duplicate in duplicates:
+            duplicate.restore(stats)
+            self.__dead += 1
+        self.__cache.put(key, stats)
 
-    def done(self) -> None:
+    def schedule(self) -> None:
+        '''Starts evaluating the players from the first one,
+        keeping up to BATCH_SIZE simulations active at once
+        '''
+
+        self.__next_index = 0
+        self.__dead = 0
+        self.__keys = {}
+        self.__duplicates = {}
+        self.__requeued = []
+        self.__batch = []
+        while len(self.__batch) < Constants.BATCH_SIZE:
+            sim = self.next_player()
+            if sim is None:
+                break
+            self.__batch.append(sim)
+
+    def done(self) -> bool:
         '''Returns whether all player simulations are dead'''
-        for sim in self.__players:
-            if not sim.dead:
-                return False
-        return True
+        return self.__dead >= len(self.__players)
 
     def current_batch_done(self) -> bool:
-        '''Returns whether the current batch is done (all simulations in the batch are dead)'''
-        for sim in self.__batch:
-            if not sim.dead:
-                return False
-        return True
-    
-    def get_current_batch(self) -> list[Simulation]:
-        '''Returns the current batch of simulations'''
-        start = Constants.BATCH_SIZE * self.__batch_index
-        end = start + Constants.BATCH_SIZE
-        if end > len(self.__players):
-            end = len(self.__players)
-        return self.__players[start:end]
-
-    def next_batch(self) -> None:
-        '''Proceeds to next batch of the generation'''
-        self.__batch_index += 1
-        self.__batch = self.get_current_batch()
+        '''Returns whether there are no active simulations left'''
+        return len(self.__batch) == 0
 
     def natural_selection(self) -> None:
         '''Simulates nature's natural selection process,
         called at the end of each generation
         '''
-        
-        self.__generation += 1
-        self.speciate() # Seperate into species
-        self.calculate_fitness() # Calculate fitness for each simulation
-        self.sort_species() # Sort from best to worst, based on fitness
-        self.cull_species() # Kill genomes that have not survived
-        self.kill_stale_species(15) # Kill species which have not improved for a while
-        self.kill_bad_species() # Kill species which cannot reproduce
-        self.set_best_player() # Update best player and best score ever
 
-        if Constants.TRAINING:
-            for s in range(5): # Save best genome of 5 best species to file
-                if len(self.__species) >= s + 1:
-                    self.__species[s].champion.brain.save(f'data/model/gen{self.__generation - 1}_spec{s + 1}.json')
-            # Save/update best ever genome
-            self.__best_player.brain.save('data/best.json')
-
-            # Log results
-            with open('data/logs.txt', 'a') as f:
-                f.write(f'new generation: {self.__generation}\n')
-                f.write(f'number of mutations: {len(self.__innovation_history)}\n')
-                f.write(f'number of species: {len(self.__species)}\n')
-                f.write(f'best score: {self.__best_score}\n')
-                f.write('------------------------------------------------------\n')
-
-        # Repopulate with new simulations
-        avg_sum = self.get_avg_fitness_sum()
-        children: list[Simulation] = []
-        for s in self.__species:
-            # Clone the champion without mutations
-            children.append(s.champion.clone())
-            # -1 since champion was already added
-            children_number = math.floor((s.avg_fitness / avg_sum) * self.__size) - 1
-            for _ in range(children_number): # Add children
-                children.append(s.get_child(self.__innovation_history))
+        with self.__random:
+            self.__generation += 1
+            self.speciate() # Seperate into species
+            self.calculate_fitness() # Calculate fitness for each simulation
+            self.sort_species() # Sort from best to worst, based on fitness
+            self.cull_species() # Kill genomes that have not survived
+            self.kill_stale_species(Constants.STALE_GENERATIONS) # Kill species which have not improved for a while
+            self.kill_bad_species() # Kill species which cannot reproduce
+            self.set_best_player() # Update best player and best score ever
+
+            if Constants.TRAINING:
+                for s in range(5): # Save best genome of 5 best species to file
+                    if len(self.__species) >= s + 1:
+                        self.__species[s].champion.brain.save(f'data/model/gen{self.__generation - 1}_spec{s + 1}.json')
+                # Save/update best ever genome
+                self.__best_player.brain.save('data/best.json')
+
+                # Log results
+                with open('data/logs.txt', 'a') as f:
+                    f.write(f'new generation: {self.__generation}\n')
+                    f.write(f'number of mutations: {len(self.__innovation_history)}\n')
+                    f.write(f'number of species: {len(self.__species)}\n')
+                    f.write(f'best score: {self.__best_score}\n')
+                    terminations = Counter(sim.stats['termination'] for sim in self.__players)
+                    f.write(f'episode terminations: {dict(terminations)}\n')
+                    f.write(f'evaluation cache hits: {self.__cache.hits}/{self.__cache.hits + self.__cache.misses}\n')
+                    f.write('------------------------------------------------------\n')
+
+            # Repopulate with new simulations
+            avg_sum = self.get_avg_fitness_sum()
+            champions: list[Evaluation] = []
+            planned: list[tuple[Evaluation, Evaluation]] = []
+            offsets: list[int] = [] # Where the planned children of each species start
+            for s in self.__species:
+                # Clone the champion without mutations
+                champions.append(s.champion.clone())
+                offsets.append(len(planned))
+                # -1 since champion was already added
+                children_number = math.floor((s.avg_fitness / avg_sum) * self.__size) - 1
+                planned += s.plan_children(children_number)
         
-        # Sometimes resulted children amount will not be enough
-        # due to flooring the number of children for each species
-        while len(children) < self.__size:
-            # Get more children from the best species untill the number of children gets big enough
-            children.append(self.__species[0].get_child(self.__innovation_history))
-
-        # Copy children to new players
-        self.__players = children.copy()
-        for sim in self.__players:
-            sim.brain.generate_phenotype() # Generate neural network for each child
-            sim.seed = self.__generation - 1
-            sim.reset()
-
-        # Set current batch
-        self.__batch_index = 0
-        self.__batch = self.get_current_batch()
+            # Sometimes resulted children amount will not be enough
+            # due to flooring the number of children for each species
+            if len(champions) + len(planned) < self.__size:
+                # Get more children from the best species untill the number of children gets big enough
+                planned += self.__species[0].plan_children(self.__size - len(champions) - len(planned))
+
+            # Breed the planned children, possibly in worker processes
+            bred: list[Evaluation] = []
+            for brain in self.breed(planned):
+                child = self.__evaluation()
+                child.brain = brain
+                bred.append(child)
+
+            # Place each champion before the children of its species, the extra children come last
+            children: list[Evaluation] = []
+            for champion, start, end in zip(champions, offsets, offsets[1:] + [len(bred)]):
+                children.append(champion)
+                children += bred[start:end]
+
+            # Each generation plays the waves of its own seed, so the episodes of the last generation cannot repeat
+            self.__cache.clear()
+
+            # Copy children to new players
+            self.__players = children.copy()
+            for sim in self.__players:
+                sim.brain.generate_phenotype() # Generate neural network for each child
+                sim.seed = self.__generation - 1
+                sim.reset()
+
+            # Start evaluating the new generation
+            self.schedule()
         
+    def breed(self, planned: list[tuple[Evaluation, Evaluation]]) -> list[Genome]:
+        '''Returns the mutated brains of the planned children
+        :param planned: the fittest parent and the second parent of each child,
+        the second parent is None for children cloned from a single parent
+        '''
+
+        # Each parent's genome is sent once, the plan refers to it by index
+        parents: list[Genome] = []
+        indices: dict[int, int] = {}
+        for sim in (sim for pair in planned for sim in pair if sim is not None):
+            if id(sim) not in indices:
+                indices[id(sim)] = len(parents)
+                parents.append(sim.brain)
+
+        plan = [(indices[id(parent1)], -1 if parent2 is None else indices[id(parent2)], random.getrandbits(32))
+                for parent1, parent2 in planned]
+        return self.__reproduction.breed(parents, plan, self.__innovation_history)
+
+    def emigrants(self, count: int) -> list[Genome]:
+        '''Returns the brains of the champions of the best species, used for migrating players to other populations
+        :param count: the maximum number of brains
+        '''
+        return [s.champion.brain for s in self.__species[:count]]
+
+    def immigrate(self, brains: list[Genome]) -> None:
+        '''Replaces the last players of the current generation with players of the given brains,
+        used for migrating players from other populations. Must be called before the generation is evaluated
+        :param brains: the brains of the migrating players
+        '''
+
+        with self.__random:
+            for i, brain in enumerate(brains[:self.__size]):
+                index = self.__size - 1 - i
+                sim = self.__evaluation()
+                sim.brain = brain
+                sim.brain.generate_phenotype()
+                sim.seed = self.__players[index].seed
+                sim.reset()
+                self.__players[index] = sim
+
+        self.schedule()
+
+    def close(self) -> None:
+        '''Stops the worker processes of the population'''
+        self.__reproduction.close()
+
     def speciate(self) -> None:
         '''
         Seperates the population's players into species based on their similarity 
@@ -251,23 +396,44 @@ class Population:
         return sum(s.avg_fitness for s in self.__species)
 
     @property
-    def players(self) -> list[Simulation]:
+    def players(self) -> list[Evaluation]:
         return self.__players
 
     @property
     def all_dead(self) -> bool:
-        return all(sim.dead for sim in self.__players)
+        return self.done()
+
+    @property
+    def alive(self) -> int:
+        return len(self.__players) - self.__dead
+
+    @property
+    def dead(self) -> int:
+        return self.__dead
 
     @property
     def generation(self) -> int:
         return self.__generation
 
+    @property
+    def best_score(self) -> int:
+        return self.__best_score
+
+    @property
+    def species(self) -> list[Species]:
+        return self.__species
+
+    @property
+    def innovation_history(self) -> InnovationHistory:
+        return self.__innovation_history
+
     @property
     def batch_index(self) -> int:
-        return self.__batch_index
+        # The batch the evaluation has reached, counted by the simulations which died
+        return min(self.__dead // Constants.BATCH_SIZE, self.__batch_amount - 1)
 
     @property
-    def batch(self) -> list[Simulation]:
+    def batch(self) -> list[Evaluation]:
         return self.__batch
 
     @property
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from NEAT.genome import Genome
+from NEAT.innovation import InnovationHistory
+from utils.random_state import RandomState
+from utils.constants import Constants
+
+import multiprocessing as mp
+
+
+class Reproduction:
+    '''Breeds the children of a generation from a central plan, in the training process or in a pool of worker processes.
+    Each child is planned as its parents and a random seed, so the children are the same no matter where they are bred.
+    Workers number their new mutations provisionally, the mutations are then reconciled with the innovation history
+    in the order of the plan, so identical mutations in the same generation still share an innovation number
+    :param workers: the number of worker processes, 0 breeds the children in this process
+    '''
+
+    def __init__(self, workers: int = 0) -> None:
+        self.__workers = workers
+        self.__pool = None # Started on the first parallel generation
+
+    def breed(self, parents: list[Genome], plan: list[tuple[int, int, int]], innovation_history: InnovationHistory) -> list[Genome]:
+        '''Returns the children of the given plan
+        :param parents: the genomes of every planned parent
+        :param plan: for each child the index of its fittest parent, the index of its second parent
+        (-1 for a clone of the first parent) and the seed of its mutations
+        :param innovation_history: record of all previous mutations
+        '''
+
+        if self.__workers < 1 or len(plan) < 2:
+            return Reproduction.breed_children(parents, plan, innovation_history)
+
+        if self.__pool is None:
+            # Workers only import the NEAT core, not the game.
+            # They get the configuration of this process, which may differ from the defaults in a sweep
+            configuration = {name: value for name, value in vars(Constants).items() if name.isupper()}
+            self.__pool = mp.get_context('spawn').Pool(
+                self.__workers, initializer=Reproduction.configure, initargs=(configuration,))
+
+        # Split the plan to a contiguous chunk for each worker
+        chunk_size = -(-len(plan) // self.__workers)
+        chunks = [plan[i:i + chunk_size] for i in range(0, len(plan), chunk_size)]
+
+        # Each worker numbers its new mutations on a copy of the history
+        data = [genome.to_json() for genome in parents]
+        history = innovation_history.copy()
+        results = self.__pool.starmap(Reproduction.breed_chunk, [(data, chunk, history) for chunk in chunks])
+
+        children: list[Genome] = []
+        numbers = Reproduction.reconcile([mutations for _, mutations in results], innovation_history)
+        for (chunk_children, _), chunk_numbers in zip(results, numbers):
+            for child in chunk_children:
+                for gene in child['genes']:
+                    gene['innovation_number'] = chunk_numbers.get(gene['innovation_number'], gene['innovation_number'])
+                children.append(Genome.from_json(child))
+
+        return children
+
+    def close(self) -> None:
+        '''Stops the worker processes'''
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool = None
+
+    @staticmethod
+    def configure(configuration: dict) -> None:
+        '''Sets the configuration of a worker process
+        :param configuration: the values of the constants by their names
+        '''
+
+        for name, value in configuration.items():
+            setattr(Constants, name, value)
+
+    @staticmethod
+    def breed_children(parents: list[Genome], plan: list[tuple[int, int, int]], innovation_history: InnovationHistory) -> list[Genome]:
+        '''Returns the mutated children of the given plan, see breed
+        :param parents: the genomes of every planned parent
+        :param plan: the parents and the seed of each child
+        :param innovation_history: record of all previous mutations, new mutations are added to it
+        '''
+
+        children: list[Genome] = []
+        for parent1, parent2, seed in plan:
+            # Each child has its own random numbers, which do not change the random numbers of the caller
+            with RandomState(seed):
+                child = parents[parent1].clone() if parent2 == -1 \
+                    else parents[parent1].crossover(parents[parent2])
+                child.mutate(innovation_history)
+            children.append(child)
+
+        return children
+
+    @staticmethod
+    def breed_chunk(parents: list[dict], plan: list[tuple[int, int, int]],
+                    innovation_history: InnovationHistory) -> tuple[list[dict], list[tuple[tuple[int, int, frozenset[int]], int]]]:
+        '''Entry point of the worker processes, breeds a chunk of the plan.
+        Returns the children and the new mutations, which are numbered provisionally by the worker's copy of the history
+        :param parents: the genomes of every planned parent, in the format of Genome.to_json
+        :param plan: the parents and the seed of each child in this chunk
+        :param innovation_history: copy of the record of all previous mutations
+        '''
+
+        known = len(innovation_history)
+
+        genomes = [Genome.from_json(data) for data in parents]
+        children = Reproduction.breed_children(genomes, plan, innovation_history)
+        return [child.to_json() for child in children], innovation_history.mutations(known)
+
+    @staticmethod
+    def reconcile(mutations: list[list[tuple[tuple[int, int, frozenset[int]], int]]],
+                  innovation_history: InnovationHistory) -> list[dict[int, int]]:
+        '''Gives the new mutations of every worker their final innovation numbers in the history,
+        in a single request to the history. Returns the final innovation number of each provisional number of each worker
+        :param mutations: the new mutations of each worker and their provisional numbers, in the order they were found
+        :param innovation_history: record of all previous mutations
+        '''
+
+        # Earlier mutations of the same worker may be part of a mutation's context, the history replaces them
+        batch = [mutation for chunk in mutations for mutation, _ in chunk]
+        provisional = [(i, number) for i, chunk in enumerate(mutations) for _, number in chunk]
+        reserved = iter(innovation_history.reserve(batch, provisional) if batch else [])
+
+        return [{number: next(reserved) for _, number in chunk} for chunk in mutations]
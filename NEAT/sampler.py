@@ -0,0 +1,54 @@
+from __future__ import annotations
+from typing import Generic, TypeVar
+
+from bisect import bisect_right
+from itertools import accumulate
+import random
+
+T = TypeVar('T')
+
+
+class FitnessSampler(Generic[T]):
+    '''Picks random items with a chance proportionate to their fitness (roulette wheel selection).
+    The cumulative fitness is computed once, so each pick is a binary search instead of a linear scan
+    :param items: the items to pick from
+    :param fitnesses: the fitness of each item
+    '''
+
+    __slots__ = ('__items', '__cumulative', '__total')
+
+    def __init__(self, items: list[T], fitnesses: list[float]) -> None:
+        self.__items = items
+        self.__cumulative = list(accumulate(fitnesses))
+        self.__total = sum(fitnesses)
+
+    def sample(self) -> T:
+        '''Returns a random item, better items have a higher chance of getting picked
+        while worse items still have a small chance of being chosen
+        '''
+
+        return self.__pick(random.uniform(0, self.__total))
+
+    def sample_pairs(self, count: int) -> list[tuple[T, T]]:
+        '''Returns the given number of random pairs of items, used for picking parents
+        :param count: the number of pairs
+        '''
+
+        # Draw every random value first, then pick all the items in one pass
+        values = [random.uniform(0, self.__total) for _ in range(count * 2)]
+        picks = [self.__pick(value) for value in values]
+        return list(zip(picks[::2], picks[1::2]))
+
+    def __pick(self, value: float) -> T:
+        '''Returns the first item whose cumulative fitness passes the given value
+        :param value: a random value between 0 and the fitness sum
+        '''
+
+        index = bisect_right(self.__cumulative, value)
+
+        if index == len(self.__items): # If by any chance the value reached the sum
+            return self.__items[0]
+        return self.__items[index]
+
+    def __len__(self) -> int:
+        return len(self.__items)
@@ -1,25 +1,102 @@
 from __future__ import annotations
 
 from src.controller import Controller
+from NEAT.evaluation import Evaluation
+from utils.constants import Constants
 
+import time
 
-class Simulation(Controller):
-    '''Simulates a thinking AI player'''
+
+class Simulation(Controller, Evaluation):
+    '''Simulates a thinking AI player, evaluating its brain in the asteroids game.
+    The episode ends when the player collides with an asteroid, or is cut when it exceeds the episode budget in Constants
+    '''
     def __init__(self) -> None:
         super().__init__(ai=True)
         self.__fitness = 0
 
+        # Episode budget
+        self.__termination: str = None # Why the episode ended, None while it runs
+        self.__last_score = 0
+        self.__last_score_frame = 0
+        self.__start_time: float = None
+        self.__steps = 0
+
     def update(self, iterations: int = 1) -> None:
         '''Updates the simulation
         :param iterations: the number of iterations to update by
         '''
 
+        if self.__start_time is None:
+            self.__start_time = time.perf_counter()
+
         for _ in range(iterations):
-            super().update()
-            self.think()
+            # Each step advances the game by TIMESTEP frames
+            super().update(Constants.TIMESTEP)
+
+            # Query the network once every few steps and hold its actions in between
+            if self.__steps % Constants.ACTION_REPEAT == 0:
+                self.think()
+            else:
+                self.act()
+            self.__steps += 1
+
+            # Stop on the frame the episode ended, the remaining iterations must not count
+            self.__termination = self.get_termination()
+            if self.__termination is not None:
+                self.release() # Dead simulations wait for the rest of the generation
+                break
+
+    def get_termination(self) -> str:
+        '''Returns why the episode ended, None if it did not end'''
+
+        if super().dead:
+            return 'collision'
+
+        if self.score != self.__last_score:
+            self.__last_score = self.score
+            self.__last_score_frame = self.lifespan
+
+        if Constants.EPISODE_MAX_FRAMES is not None \
+            and self.lifespan >= Constants.EPISODE_MAX_FRAMES:
+            return 'max_frames'
+
+        if Constants.EPISODE_SCORELESS_FRAMES is not None \
+            and self.lifespan - self.__last_score_frame >= Constants.EPISODE_SCORELESS_FRAMES:
+            return 'no_score'
+
+        if Constants.EPISODE_TIME_LIMIT is not None \
+            and time.perf_counter() - self.__start_time >= Constants.EPISODE_TIME_LIMIT:
+            return 'time_limit'
+
+        return None
+
+    def reset(self) -> None:
+        '''Starts the episode over with the same brain'''
+        super().reset()
+        self.__termination = None
+        self.__last_score = 0
+        self.__last_score_frame = 0
+        self.__start_time = None
+        self.__steps = 0
+
+    def restore(self, stats: dict) -> None:
+        '''Ends the episode with the statistics of an identical episode, without simulating it
+        :param stats: the statistics of the identical episode
+        '''
+
+        self.score = stats['score']
+        self.lifespan = stats['lifespan']
+        self.shots_fired = stats['shots_fired']
+        self.shots_hit = stats['shots_hit']
+        self.__termination = stats['termination']
+        self.release()
 
     def calculate_fitness(self) -> None:
-        '''Calculates score used to determine player's survival in next generations'''
+        '''Calculates score used to determine player's survival in next generations.
+        A cut episode is scored as if the player collided on the frame it was cut,
+        so the lifespan of a player that avoids the asteroids without scoring stops counting at the cut
+        '''
         accuracy = self.shots_hit / self.shots_fired
         self.__fitness = (self.score + 1) * 100
         self.__fitness += self.lifespan * 5
@@ -47,10 +124,39 @@ class Simulation(Controller):
         copy.fitness = self.fitness
         return copy
     
+    @property
+    def dead(self) -> bool:
+        return self.__termination is not None
+
+    @property
+    def termination(self) -> str:
+        return self.__termination
+
+    @property
+    def stats(self) -> dict:
+        return {
+            'score': self.score,
+            'lifespan': self.lifespan,
+            'shots_fired': self.shots_fired,
+            'shots_hit': self.shots_hit,
+            'termination': self.__termination,
+            'action_repeat': Constants.ACTION_REPEAT,
+            'timestep': Constants.TIMESTEP,
+        }
+
+    @property
+    def config(self) -> tuple:
+        # Settings which change the result of an episode
+        return (Constants.TIMESTEP, Constants.ACTION_REPEAT, Constants.SWEPT_COLLISIONS,
+                Constants.EPISODE_MAX_FRAMES, Constants.EPISODE_SCORELESS_FRAMES, Constants.EPISODE_TIME_LIMIT,
+                Constants.RAY_AMOUNT, Constants.FPS, Constants.SHOOT_COOLDOWN, Constants.PROJECTILE_SPEED,
+                Constants.PLAYER_BOOST_SPEED, Constants.PLAYER_TURN_SPEED, Constants.PLAYER_AIR_FRICTION,
+                Constants.ASTEROID_VELOCITY, Constants.ASTEROID_HITS, Constants.SCORE_SYSTEM)
+
     @property
     def fitness(self) -> float:
         return self.__fitness
 
     @fitness.setter
     def fitness(self, fitness: float) -> None:
-        self.__fitness = fitness
\ No newline at end of file
+        self.__fitness = fitness
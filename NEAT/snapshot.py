@@ -0,0 +1,350 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from NEAT.trainer import Trainer
+
+from NEAT.genome import Genome
+from utils.geometry.vector import PositionVector
+
+import struct
+
+
+class HitboxView:
+    '''Read-only copy of a hitbox, holding everything needed to draw it
+    :param x: X coordinate of the hitbox's center
+    :param y: Y coordinate of the hitbox's center
+    :param width: the width of the hitbox
+    :param height: the height of the hitbox
+    :param index: the sprite index of the hitbox
+    '''
+
+    __slots__ = ('pos', 'width', 'height', 'index')
+
+    def __init__(self, x: float, y: float, width: float, height: float, index: int) -> None:
+        self.pos = PositionVector(x, y)
+        self.width = width
+        self.height = height
+        self.index = index
+
+    @property
+    def rect_verts(self) -> list[tuple[float, float]]:
+        x, y, w, h = self.pos.x, self.pos.y, self.width * .5, self.height * .5
+        return [(x - w, y - h), (x + w, y - h), (x + w, y + h), (x - w, y + h)]
+
+
+class SpriteView:
+    '''Read-only copy of a drawable game component (asteroid or projectile)
+    :param hitbox: the hitbox of the component
+    :param angle: the drawing angle of the component, measured in degrees
+    :param alpha: the opacity of the component
+    '''
+
+    __slots__ = ('hitbox', 'angle', 'alpha')
+
+    def __init__(self, hitbox: HitboxView, angle: int, alpha: int = 255) -> None:
+        self.hitbox = hitbox
+        self.angle = angle
+        self.alpha = alpha
+
+
+class PlayerView:
+    '''Read-only copy of the player
+    :param hitbox: the hitbox of the player
+    :param angle: the drawing angle of the player, measured in degrees
+    :param angle_radians: the direction of the player, measured in radians
+    :param boosting: whether the player is boosting
+    :param projectiles: the fired projectiles of the player
+    '''
+
+    __slots__ = ('hitbox', 'angle', 'angle_radians', 'boosting', 'projectiles')
+
+    def __init__(self, hitbox: HitboxView, angle: int, angle_radians: float,
+                 boosting: bool, projectiles: list[SpriteView]) -> None:
+        self.hitbox = hitbox
+        self.angle = angle
+        self.angle_radians = angle_radians
+        self.boosting = boosting
+        self.projectiles = projectiles
+
+
+class RayView:
+    '''Read-only copy of a vision ray
+    :param looped: whether the ray hit through the edge of the screen
+    :param hit: whether the ray hit an asteroid
+    :param first: the main segment of the ray, or the looped segment for looped rays
+    :param second: the segment until the edge of the screen for looped rays
+    '''
+
+    __slots__ = ('is_looped', 'hit', '__first', '__second')
+
+    def __init__(self, looped: bool, hit: bool, first: tuple[float, ...], second: tuple[float, ...]) -> None:
+        self.is_looped = looped
+        self.hit = hit
+        self.__first = first
+        self.__second = second
+
+    def __iter__(self) -> iter:
+        return iter(self.__first)
+
+    @property
+    def looped(self) -> tuple[float, float, float, float]:
+        return self.__first
+
+    @property
+    def infinite(self) -> tuple[float, float, float, float]:
+        return self.__second
+
+
+class Snapshot:
+    '''The state of the followed simulation at a single frame, as read from a snapshot buffer'''
+
+    __slots__ = ('generation', 'batch_index', 'batch_amount', 'index', 'batch_size',
+                 'score', 'player', 'asteroids', 'hidden_asteroids', 'rays', 'genome')
+
+    def __init__(self) -> None:
+        self.generation = 0
+        self.batch_index = 0
+        self.batch_amount = 0
+        self.index = 0
+        self.batch_size = 0
+        self.score = 0
+        self.player: PlayerView = None
+        self.asteroids: list[SpriteView] = []
+        self.hidden_asteroids = 0 # Asteroids beyond the buffer's limit, which are not drawn
+        self.rays: list[RayView] = []
+        self.genome: Genome = None
+
+
+class SnapshotBuffer:
+    '''Fixed-layout buffer of doubles holding a snapshot of the simulation followed by a trainer.
+    The buffer can be shared between processes, a sequence number guards the readers
+    from reading a snapshot while it is being written.
+    The genome layout is only rewritten when the followed genome changes
+    :param buffer: writable buffer of at least size(rays) doubles
+    :param rays: the number of rays of the followed players
+    '''
+
+    HEADER = ('sequence', 'generation', 'batch_index', 'batch_amount', 'index', 'batch_size', 'score',
+              'player_x', 'player_y', 'player_width', 'player_height', 'player_sprite',
+              'player_angle', 'player_radians', 'boosting',
+              'asteroid_count', 'asteroid_total', 'projectile_count', 'ray_count', 'max_rays',
+              'genome_version', 'inputs', 'outputs', 'layers', 'next_node', 'bias_node', 'node_count', 'gene_count')
+
+    # Maximum amount and number of fields of each component
+    MAX_ASTEROIDS, ASTEROID_FIELDS = 128, 6 # x, y, width, height, sprite, angle
+    MAX_PROJECTILES, PROJECTILE_FIELDS = 16, 7 # x, y, width, height, sprite, angle, alpha
+    MAX_NODES, NODE_FIELDS = 256, 2 # number, layer
+    MAX_GENES, GENE_FIELDS = 2048, 5 # from node, to node, weight, innovation number, enabled
+    RAY_FIELDS = 10 # looped, hit, two segments, the number of rays is given to each buffer
+
+    # Offset of each section, measured in doubles.
+    # The rays are last, so only the size of the buffer depends on their number
+    ASTEROIDS = len(HEADER)
+    PROJECTILES = ASTEROIDS + MAX_ASTEROIDS * ASTEROID_FIELDS
+    NODES = PROJECTILES + MAX_PROJECTILES * PROJECTILE_FIELDS
+    GENES = NODES + MAX_NODES * NODE_FIELDS
+    RAYS = GENES + MAX_GENES * GENE_FIELDS
+
+    def __init__(self, buffer, rays: int) -> None:
+        self.__buffer = memoryview(buffer).cast('B')
+        self.__header = struct.Struct(f'{len(SnapshotBuffer.HEADER)}d')
+        self.__rays = rays
+
+        if len(self.__buffer) < SnapshotBuffer.size(rays) * 8:
+            raise ValueError(f'A snapshot buffer of {len(self.__buffer)} bytes cannot hold {rays} rays')
+
+        # Writer state
+        self.__sequence = 0
+        self.__written_genome: Genome = None
+        self.__genome_version = 0
+
+        # Reader state
+        self.__read_version = 0
+        self.__genome: Genome = None
+
+    def write(self, trainer: Trainer) -> None:
+        '''Writes a snapshot of the simulation followed by the given trainer
+        :param trainer: the trainer to take the snapshot from
+        '''
+
+        population, sim = trainer.population, trainer.controller
+        player = sim.player
+
+        # Odd sequence numbers mark a snapshot in progress
+        self.__sequence += 1
+        struct.pack_into('d', self.__buffer, 0, self.__sequence)
+
+        asteroids = sim.asteroids[:SnapshotBuffer.MAX_ASTEROIDS]
+        values = []
+        for asteroid in asteroids:
+            hitbox = asteroid.hitbox
+            values += (hitbox.pos.x, hitbox.pos.y, hitbox.width, hitbox.height, hitbox.index, asteroid.angle)
+        self.__pack(SnapshotBuffer.ASTEROIDS, values)
+
+        projectiles = player.projectiles[:SnapshotBuffer.MAX_PROJECTILES]
+        values = []
+        for projectile in projectiles:
+            hitbox = projectile.hitbox
+            values += (hitbox.pos.x, hitbox.pos.y, hitbox.width, hitbox.height, hitbox.index,
+                       projectile.angle, projectile.alpha)
+        self.__pack(SnapshotBuffer.PROJECTILES, values)
+
+        rays = list(player.ray_set)
+        if len(rays) > self.__rays:
+            raise ValueError(f'The snapshot buffer holds {self.__rays} rays, the player has {len(rays)}')
+        values = []
+        for ray in rays:
+            if ray.is_looped:
+                values += (1, 1, *ray.looped, *ray.infinite)
+            else:
+                values += (0, int(ray.hit is not None), *ray, 0, 0, 0, 0)
+        self.__pack(SnapshotBuffer.RAYS, values)
+
+        # Only write the genome layout when the followed genome changes
+        genome = sim.brain
+        if genome is not self.__written_genome:
+            self.__written_genome = genome
+            self.__genome_version += 1
+            self.__write_genome(genome)
+
+        hitbox = player.hitbox
+        self.__header.pack_into(self.__buffer, 0,
+            self.__sequence, population.generation, population.batch_index, population.batch_amount,
+            trainer.index, len(population.batch), sim.score,
+            hitbox.pos.x, hitbox.pos.y, hitbox.width, hitbox.height, hitbox.index,
+            player.angle, player.angle_radians, int(player.boosting),
+            len(asteroids), len(sim.asteroids), len(projectiles), len(rays), self.__rays,
+            self.__genome_version, genome.inputs, genome.outputs, genome.layers, genome.next_node, genome.bias_node,
+            min(len(genome.nodes), SnapshotBuffer.MAX_NODES), min(len(genome.genes), SnapshotBuffer.MAX_GENES))
+
+        # Even sequence numbers mark a complete snapshot
+        self.__sequence += 1
+        struct.pack_into('d', self.__buffer, 0, self.__sequence)
+
+    @staticmethod
+    def size(rays: int) -> int:
+        '''Returns the number of doubles a buffer needs to hold snapshots of players with the given number of rays
+        :param rays: the number of rays of the followed players
+        '''
+        return SnapshotBuffer.RAYS + rays * SnapshotBuffer.RAY_FIELDS
+
+    def __write_genome(self, genome: Genome) -> None:
+        '''Writes the layout of the given genome
+        :param genome: the genome to write
+        '''
+
+        values = []
+        for node in genome.nodes[:SnapshotBuffer.MAX_NODES]:
+            values += (node.number, node.layer)
+        self.__pack(SnapshotBuffer.NODES, values)
+
+        values = []
+        for gene in genome.genes[:SnapshotBuffer.MAX_GENES]:
+            values += (gene.from_node.number, gene.to_node.number, gene.weight,
+                       gene.innovation_number, int(gene.enabled))
+        self.__pack(SnapshotBuffer.GENES, values)
+
+    def __pack(self, offset: int, values: list[float]) -> None:
+        '''Writes a list of values to the buffer
+        :param offset: the offset to write at, measured in doubles
+        :param values: the values to write
+        '''
+        struct.pack_into(f'{len(values)}d', self.__buffer, offset * 8, *values)
+
+    def __unpack(self, data: bytes, offset: int, count: int, fields: int) -> list[tuple[float, ...]]:
+        '''Reads a section of records from a copy of the buffer
+        :param data: the copy of the buffer
+        :param offset: the offset of the section, measured in doubles
+        :param count: the number of records to read
+        :param fields: the number of fields in each record
+        '''
+
+        values = struct.unpack_from(f'{count * fields}d', data, offset * 8)
+        return [values[i:i + fields] for i in range(0, len(values), fields)]
+
+    def read(self) -> Snapshot:
+        '''Reads the latest complete snapshot,
+        returns None if there is none or if it was being written while reading
+        '''
+
+        sequence = struct.unpack_from('d', self.__buffer, 0)[0]
+        if sequence == 0 or sequence % 2 == 1:
+            return None
+
+        data = bytes(self.__buffer)
+        if struct.unpack_from('d', self.__buffer, 0)[0] != sequence:
+            return None # The snapshot was changed while copying it
+
+        header = dict(zip(SnapshotBuffer.HEADER, self.__header.unpack_from(data, 0)))
+        if int(header['max_rays']) != self.__rays:
+            raise ValueError(f'The snapshot was written for {int(header["max_rays"])} rays, expected {self.__rays}')
+        snapshot = Snapshot()
+
+        snapshot.generation = int(header['generation'])
+        snapshot.batch_index = int(header['batch_index'])
+        snapshot.batch_amount = int(header['batch_amount'])
+        snapshot.index = int(header['index'])
+        snapshot.batch_size = int(header['batch_size'])
+        snapshot.score = int(header['score'])
+
+        snapshot.hidden_asteroids = int(header['asteroid_total'] - header['asteroid_count'])
+        snapshot.asteroids = [
+            SpriteView(HitboxView(x, y, w, h, int(index)), int(angle))
+            for x, y, w, h, index, angle in self.__unpack(
+                data, SnapshotBuffer.ASTEROIDS, int(header['asteroid_count']), SnapshotBuffer.ASTEROID_FIELDS)
+        ]
+
+        projectiles = [
+            SpriteView(HitboxView(x, y, w, h, int(index)), int(angle), int(alpha))
+            for x, y, w, h, index, angle, alpha in self.__unpack(
+                data, SnapshotBuffer.PROJECTILES, int(header['projectile_count']), SnapshotBuffer.PROJECTILE_FIELDS)
+        ]
+
+        snapshot.player = PlayerView(
+            HitboxView(header['player_x'], header['player_y'], header['player_width'],
+                       header['player_height'], int(header['player_sprite'])),
+            int(header['player_angle']), header['player_radians'], bool(header['boosting']), projectiles)
+
+        snapshot.rays = [
+            RayView(bool(record[0]), bool(record[1]), record[2:6], record[6:10])
+            for record in self.__unpack(data, SnapshotBuffer.RAYS, int(header['ray_count']), SnapshotBuffer.RAY_FIELDS)
+        ]
+
+        # Rebuild the genome only when it has changed
+        version = int(header['genome_version'])
+        if version != self.__read_version:
+            self.__read_version = version
+            self.__genome = self.__read_genome(data, header)
+        snapshot.genome = self.__genome
+
+        return snapshot
+
+    def __read_genome(self, data: bytes, header: dict[str, float]) -> Genome:
+        '''Builds the genome written in a copy of the buffer
+        :param data: the copy of the buffer
+        :param header: the header of the snapshot
+        '''
+
+        nodes = self.__unpack(data, SnapshotBuffer.NODES, int(header['node_count']), SnapshotBuffer.NODE_FIELDS)
+        genes = self.__unpack(data, SnapshotBuffer.GENES, int(header['gene_count']), SnapshotBuffer.GENE_FIELDS)
+
+        # Skip genes of nodes that did not fit in the buffer
+        numbers = set(number for number, _ in nodes)
+        genes = [gene for gene in genes if gene[0] in numbers and gene[1] in numbers]
+
+        return Genome.from_json({
+            'inputs': int(header['inputs']),
+            'outputs': int(header['outputs']),
+            'nodes': [{ 'number': int(number), 'layer': int(layer) } for number, layer in nodes],
+            'genes': [{
+                'from_node': int(from_node),
+                'to_node': int(to_node),
+                'weight': weight,
+                'innovation_number': int(innovation_number),
+                'enabled': bool(enabled),
+            } for from_node, to_node, weight, innovation_number, enabled in genes],
+            'layers': int(header['layers']),
+            'next_node': int(header['next_node']),
+            'bias_node': int(header['bias_node']),
+        })
@@ -1,8 +1,12 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
 
-from NEAT.simulation import Simulation
-from NEAT.genome import Genome
-from NEAT.connection_history import ConnectionHistory
+if TYPE_CHECKING:
+    from NEAT.evaluation import Evaluation
+    from NEAT.genome import Genome
+
+from NEAT.sampler import FitnessSampler
+from utils.constants import Constants
 
 import random
 
@@ -14,11 +18,12 @@ class Species:
     :param sim: the simulation to build this species from
     '''
     
-    def __init__(self, sim: Simulation) -> None:
+    def __init__(self, sim: Evaluation) -> None:
 
-        self.__players: list[Simulation] = []
+        self.__players: list[Evaluation] = []
         self.__avg_fitness = 0
         self.__staleness = 0 # Number of generations the species has gone without any improvements
+        self.__sampler: FitnessSampler[Evaluation] = None # Built once the players and their fitness are final
 
         self.__players.append(sim)
         self.__best_fitness = sim.fitness # Only genome so it's the best
@@ -26,9 +31,9 @@ class Species:
         self.__champion = sim.clone()
 
         # Compatability
-        self.__EXCESS_COEFFICIENT = 1.5
-        self.__WEIGHT_DIFFERENCE_COEFFICIENT = 0.8
-        self.__COMPATABILITY_THREASHOLD = 2
+        self.__EXCESS_COEFFICIENT = Constants.EXCESS_COEFFICIENT
+        self.__WEIGHT_DIFFERENCE_COEFFICIENT = Constants.WEIGHT_DIFFERENCE_COEFFICIENT
+        self.__COMPATABILITY_THREASHOLD = Constants.COMPATIBILITY_THRESHOLD
 
     def same_species(self, genome: Genome) -> bool:
         '''Returns whether the given genome belongs to this species
@@ -48,10 +53,11 @@ class Species:
             
         return self.__COMPATABILITY_THREASHOLD > compatability
 
-    def add(self, sim: Simulation) -> None:
+    def add(self, sim: Evaluation) -> None:
         '''Adds the given simulation to the species
         :param sim: the simulation to add'''
         self.__players.append(sim)
+        self.__sampler = None
 
     @staticmethod
     def get_excess_disjoint(brain1: Genome, brain2: Genome) -> int:
@@ -105,6 +111,7 @@ class Species:
 
         # Sort list by fitness
         self.__players.sort(key=lambda sim: sim.fitness, reverse=True)
+        self.__sampler = None
         
         # New best was found
         best = self.__players[0]
@@ -120,47 +127,40 @@ class Species:
         '''Sets average fitness of this species' simulations'''
         self.__avg_fitness = sum(sim.fitness for sim in self.__players) / len(self.__players)
         
-    def get_child(self, innovation_history: list[ConnectionHistory]) -> Simulation:
-        '''Gets and returns a child from two players in this species
-        :innovation_history: global list of all previous mutations
+    def plan_children(self, count: int) -> list[tuple[Evaluation, Evaluation]]:
+        '''Picks the parents of the given number of children.
+        Returns the fittest parent first, the second parent is None for children cloned from a single player.
+        The cloned children come first, the parents of the crossover children are picked together
+        :param count: the number of children
         '''
 
-        baby: Simulation = None
-        # 25% chance to skip crossover
-        if random.random() < 0.25:
-            baby = self.select_player().clone()
-        else: # Do crossover of two selected parents from the mating pool
-            parent1 = self.select_player()
-            parent2 = self.select_player()
-
-            # Crossover the best parent with the second parent
-            baby = parent1.crossover(parent2) \
-                if parent1.fitness > parent2.fitness \
-                    else parent2.crossover(parent1)
-
-        # Mutate child's brain
-        baby.brain.mutate(innovation_history)
-        return baby
-    
-    def select_player(self) -> Simulation:
+        # 25% chance for each child to skip crossover
+        clones = sum(random.random() < 0.25 for _ in range(count))
+
+        parents: list[tuple[Evaluation, Evaluation]] = [(self.select_player(), None) for _ in range(clones)]
+        for parent1, parent2 in self.select_parents(count - clones):
+            parents.append((parent1, parent2) if parent1.fitness > parent2.fitness else (parent2, parent1))
+
+        return parents
+
+    def select_player(self) -> Evaluation:
         '''Gets and returns a random player based on its fitness.
         Better players will have a higher chance of getting picked,
         while worse players will still have a small chance of being chosen from the pool
         '''
+        return self.sampler.sample()
 
-        # Get a number between 0 and the fitness sum of all players in the species
-        fitness_sum = sum(sim.fitness for sim in self.__players)
-        random_value = random.uniform(0, fitness_sum)
-
-        # The closer the accumalating sum gets to the random value,
-        # the easier for worse players to get chosen
-        accumalating_sum = 0
-        for sim in self.__players:
-            accumalating_sum += sim.fitness
-            if accumalating_sum > random_value:
-                return sim
+    def select_parents(self, count: int) -> list[tuple[Evaluation, Evaluation]]:
+        '''Returns the given number of random parent pairs, picked based on their fitness
+        :param count: the number of pairs
+        '''
+        return self.sampler.sample_pairs(count)
 
-        return self.__players[0] # If by any chance this didn't work
+    def build_sampler(self) -> None:
+        '''Builds the fitness proportionate sampler of this species' players,
+        must be called again whenever the players or their fitness change
+        '''
+        self.__sampler = FitnessSampler(self.__players, [sim.fitness for sim in self.__players])
 
     def cull(self):
         '''As a part of the natural selection process, 
@@ -173,6 +173,7 @@ class Species:
             # Iterate backwards
             for i in range(len(self.__players) - 1, len(self.__players) // 2, -1):
                 self.__players.pop(i)
+            self.__sampler = None
 
     def apply_fitness_sharing(self) -> None:
         '''Divide sthe fitness of each player by the number of the players in its species, 
@@ -182,16 +183,19 @@ class Species:
         for sim in self.__players:
             sim.fitness /= len(self.__players)
 
+        # The fitness is final for this generation
+        self.build_sampler()
+
     @property
     def avg_fitness(self) -> float:
         return self.__avg_fitness
     
     @property
-    def champion(self) -> Simulation:
+    def champion(self) -> Evaluation:
         return self.__champion
     
     @property
-    def players(self) -> list[Simulation]:
+    def players(self) -> list[Evaluation]:
         return self.__players
 
     @property
@@ -202,6 +206,13 @@ class Species:
     def staleness(self) -> int:
         return self.__staleness
 
+    @property
+    def sampler(self) -> FitnessSampler[Evaluation]:
+        if self.__sampler is None:
+            self.build_sampler()
+        return self.__sampler
+
     @players.setter
-    def players(self, players: list[Simulation]) -> None:
-        self.__players = players
\ No newline at end of file
+    def players(self, players: list[Evaluation]) -> None:
+        self.__players = players
+        self.__sampler = None
\ No newline at end of file
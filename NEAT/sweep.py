@@ -0,0 +1,217 @@
+'''Hyperparameter sweep over the training constants, running headless trainings side by side.
+Usage: python -m NEAT.sweep sweep.json
+
+The JSON file holds either a grid of values for each constant, or ranges to sample randomly:
+    {"grid": {"NODE_MUTATION_CHANCE": [0.03, 0.1], "POPULATION_SIZE": [150, 300]}, "generations": 20}
+    {"random": {"COMPATIBILITY_THRESHOLD": [1, 4], "STALE_GENERATIONS": [5, 30]}, "samples": 16}
+and optionally "generations", "cores_per_run", "seed", "grace" and "results" (see Sweep)
+'''
+
+from __future__ import annotations
+from typing import Iterator
+
+from NEAT.population import Population
+from utils.geometry.collision import SpriteDimensions
+from utils.constants import Constants
+
+import multiprocessing as mp
+import itertools
+import statistics
+import random
+import queue
+import json
+import time
+import csv
+import sys
+import os
+
+
+class Sweep:
+    '''Trains every configuration headless, running as many trainings side by side as the cores allow.
+    The results of every generation of every run are streamed into a single results table,
+    and runs scoring below the median of the other runs at the same generation are stopped early
+    :param configurations: the values of the constants of each run, by their names in Constants
+    :param generations: the number of generations of each run
+    :param cores_per_run: the cores each run may use, runs with more than one core breed their children in worker processes
+    :param seed: the seed of every run's population, the same for all runs so they are compared on equal terms
+    :param grace: the number of generations before a run can be stopped early
+    :param results_path: the CSV file the results table is written to
+    '''
+
+    COLUMNS = ('run', 'generation', 'best_score', 'species', 'seconds', 'status')
+
+    def __init__(self, configurations: list[dict], generations: int = 20, cores_per_run: int = 1,
+                 seed: int = 0, grace: int = 5, results_path: str = 'data/sweep.csv') -> None:
+
+        for configuration in configurations:
+            for name in configuration:
+                if not name.isupper() or not hasattr(Constants, name):
+                    raise ValueError(f'Unknown constant: {name}')
+
+        self.__configurations = configurations
+        self.__generations = generations
+        self.__cores_per_run = cores_per_run
+        self.__seed = seed
+        self.__grace = grace
+        self.__results_path = results_path
+
+        # Best score of each run at each generation, used for stopping runs early
+        self.__scores: dict[int, dict[int, int]] = {}
+
+    @staticmethod
+    def grid(space: dict[str, list]) -> list[dict]:
+        '''Returns every combination of the given values
+        :param space: the values of each constant
+        '''
+
+        names = list(space)
+        return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+    @staticmethod
+    def random_search(space: dict[str, list], samples: int, seed: int = None) -> list[dict]:
+        '''Returns configurations sampled uniformly from the given ranges,
+        integers are sampled for ranges of integers
+        :param space: the lowest and the highest value of each constant
+        :param samples: the number of configurations
+        :param seed: the seed of the samples
+        '''
+
+        rng = random.Random(seed)
+        return [{name: rng.randint(low, high) if isinstance(low, int) and isinstance(high, int)
+                 else rng.uniform(low, high) for name, (low, high) in space.items()}
+                for _ in range(samples)]
+
+    def losing(self, run: int, generation: int, score: int) -> bool:
+        '''Returns whether the run scores below the median of the other runs at the same generation (median stopping rule)
+        :param run: the index of the run
+        :param generation: the generation of the score
+        :param score: the best score of the run so far
+        '''
+
+        scores = self.__scores.setdefault(generation, {})
+        scores[run] = score
+
+        others = [other for index, other in scores.items() if index != run]
+        return generation >= self.__grace and len(others) >= 2 and score < statistics.median(others)
+
+    def run(self) -> Iterator[dict]:
+        '''Runs the sweep, yields the rows of the results table as they arrive'''
+
+        context = mp.get_context('spawn')
+        results = context.Queue()
+        slots = max(1, (os.cpu_count() or 1) // self.__cores_per_run)
+
+        pending = list(enumerate(self.__configurations))
+        running: dict[int, tuple[mp.Process, mp.Event]] = {}
+
+        names = sorted({name for configuration in self.__configurations for name in configuration})
+        with open(self.__results_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=Sweep.COLUMNS + tuple(names))
+            writer.writeheader()
+
+            while pending or running:
+                # Start runs on the free cores
+                while pending and len(running) < slots:
+                    index, configuration = pending.pop(0)
+                    configuration = {'REPRODUCTION_WORKERS': self.__cores_per_run - 1, **configuration}
+
+                    stop = context.Event()
+                    # Not a daemon, so the run can start its own reproduction workers
+                    process = context.Process(target=Sweep.train, args=(
+                        index, configuration, self.__generations, self.__seed,
+                        dict(SpriteDimensions.dimensions), results, stop))
+                    process.start()
+                    running[index] = (process, stop)
+
+                try:
+                    index, generation, best_score, species, seconds = results.get(timeout=1)
+                except queue.Empty:
+                    # A run which crashed never reports that it is done
+                    for index in [index for index, (process, _) in running.items() if not process.is_alive()]:
+                        running.pop(index)[0].join()
+                        row = {'run': index, 'status': 'failed', **self.__configurations[index]}
+                        writer.writerow(row)
+                        yield row
+                    continue
+
+                if generation is None: # The run is done
+                    running.pop(index)[0].join()
+                    continue
+
+                status = 'running'
+                if generation == self.__generations:
+                    status = 'done'
+                elif self.losing(index, generation, best_score):
+                    status = 'stopped'
+                    running[index][1].set()
+
+                row = {'run': index, 'generation': generation, 'best_score': best_score, 'species': species,
+                       'seconds': round(seconds, 2), 'status': status, **self.__configurations[index]}
+                writer.writerow(row)
+                f.flush()
+                yield row
+
+    @staticmethod
+    def train(index: int, configuration: dict, generations: int, seed: int,
+              dimensions: dict[str, list[tuple[int, int]]], results: mp.Queue, stop: mp.Event) -> None:
+        '''Entry point of a run process, trains a population with the given configuration
+        :param index: the index of the run
+        :param configuration: the values of the constants by their names
+        :param generations: the number of generations
+        :param seed: the seed of the population
+        :param dimensions: the dimensions of each sprite in the game
+        :param results: queue of the results of each generation
+        :param stop: set when the run should stop early
+        '''
+
+        SpriteDimensions.dimensions.update(dimensions)
+        for name, value in configuration.items():
+            setattr(Constants, name, value)
+
+        start = time.perf_counter()
+        population = Population(Constants.POPULATION_SIZE, seed=seed)
+
+        for _ in range(generations):
+            while not population.done():
+                population.update(iterations=Constants.ITERATIONS)
+            population.natural_selection()
+
+            results.put((index, population.generation, population.best_score,
+                         len(population.species), time.perf_counter() - start))
+            if stop.is_set():
+                break
+
+        population.close()
+        results.put((index, None, None, None, None))
+
+
+def main() -> None:
+    with open(sys.argv[1], 'r') as f:
+        config = json.load(f)
+
+    if 'grid' in config:
+        configurations = Sweep.grid(config['grid'])
+    else:
+        configurations = Sweep.random_search(config['random'], config.get('samples', 8), config.get('seed'))
+
+    if not os.path.exists('data'):
+        os.mkdir('data')
+    SpriteDimensions.load()
+
+    sweep = Sweep(configurations, generations=config.get('generations', 20),
+                  cores_per_run=config.get('cores_per_run', 1), seed=config.get('seed', 0),
+                  grace=config.get('grace', 5), results_path=config.get('results', 'data/sweep.csv'))
+
+    best: dict[int, dict] = {}
+    for row in sweep.run():
+        print(', '.join(f'{name}={value}' for name, value in row.items()))
+        if row.get('best_score') is not None:
+            best[row['run']] = row
+
+    print()
+    for row in sorted(best.values(), key=lambda row: row['best_score'], reverse=True):
+        print(f"run {row['run']}: best score {row['best_score']} after {row['generation']} generations ({row['status']})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from NEAT.simulation import Simulation
+
+from NEAT.population import Population
+from NEAT.reproduction import Reproduction
+from NEAT.snapshot import SnapshotBuffer, Snapshot
+from utils.geometry.collision import SpriteDimensions
+from utils.constants import Constants
+
+import multiprocessing as mp
+import atexit
+import queue
+
+
+class Trainer:
+    '''Headless training engine, advances the population
+    and follows one of the simulations in the current batch
+    :param population_size: size of the genetic algorithm population
+    '''
+
+    def __init__(self, population_size: int = Constants.POPULATION_SIZE) -> None:
+        self.__population = Population(population_size)
+        self.__controller: Simulation = None
+        self.__index = 0
+        self.follow_first()
+
+    def step(self) -> None:
+        '''Advances the training by a single frame'''
+
+        if not self.__population.done():
+            self.__population.update(iterations=Constants.ITERATIONS)
+
+            if self.__controller.dead:
+                self.follow_slot()
+        else:
+            self.__population.natural_selection()
+            self.follow_first()
+
+    def follow_first(self) -> None:
+        '''Follows the first simulation in the current batch,
+        keeps following the previous simulation if the batch is empty
+        '''
+
+        self.__index = 0
+        if not self.__population.current_batch_done():
+            self.__controller = self.__population.batch[0]
+
+    def follow_slot(self) -> None:
+        '''Follows the simulation which replaced the followed simulation in its slot,
+        proceeds to the next simulation if the slot was not refilled
+        '''
+
+        batch = self.__population.batch
+        if self.__index < len(batch) and not batch[self.__index].dead:
+            self.__controller = batch[self.__index]
+        else:
+            self.next_player()
+
+    def next_index(self) -> None:
+        '''Proceeds to next index of simulation in current batch'''
+
+        self.__index += 1
+
+        if self.__index >= len(self.__population.batch):
+            self.__index = 0
+
+        self.__controller = self.__population.batch[self.__index]
+
+    def next_player(self) -> None:
+        '''Proceeds to the next simulation in the current batch,
+        assuming that at least one player is alive
+        '''
+
+        if self.__population.current_batch_done() \
+            or len(self.__population.players) < 2:
+            return
+
+        self.next_index()
+        while self.__controller.dead:
+            self.next_index()
+
+    @property
+    def population(self) -> Population:
+        return self.__population
+
+    @property
+    def controller(self) -> Simulation:
+        return self.__controller
+
+    @property
+    def index(self) -> int:
+        return self.__index
+
+
+class TrainingProcess:
+    '''Runs a Trainer in a separate process at full speed.
+    The followed simulation is published to a shared snapshot buffer every frame,
+    which the viewer only has to read and draw
+    :param population_size: size of the genetic algorithm population
+    '''
+
+    def __init__(self, population_size: int = Constants.POPULATION_SIZE) -> None:
+        # Spawn a fresh interpreter, the trainer does not need the parent's pygame state
+        context = mp.get_context('spawn')
+
+        # The trainer gets the configuration of this process, so its players have the rays the buffer is sized for
+        configuration = {name: value for name, value in vars(Constants).items() if name.isupper()}
+        shared = context.RawArray('d', SnapshotBuffer.size(Constants.RAY_AMOUNT))
+        self.__snapshots = SnapshotBuffer(shared, Constants.RAY_AMOUNT)
+        self.__commands = context.Queue()
+
+        # The sprite dimensions are loaded by the game screen, which the trainer process does not have.
+        # Not a daemon, so the trainer can start its own reproduction workers
+        self.__process = context.Process(
+            target=TrainingProcess.run,
+            args=(population_size, configuration, dict(SpriteDimensions.dimensions), shared, self.__commands))
+
+    def start(self) -> None:
+        '''Starts training in the background, the training is stopped when the viewer exits'''
+        self.__process.start()
+        atexit.register(self.stop)
+
+    def pause(self) -> None:
+        '''Pauses the training untill it is resumed'''
+        self.__commands.put('pause')
+
+    def resume(self) -> None:
+        '''Resumes a paused training'''
+        self.__commands.put('resume')
+
+    def next_player(self) -> None:
+        '''Makes the trainer follow the next alive simulation'''
+        self.__commands.put('next')
+
+    def stop(self) -> None:
+        '''Stops the training process, terminates it if it does not stop in time'''
+        self.__commands.put('stop')
+        self.__process.join(Constants.TRAINING_STOP_TIMEOUT)
+        if self.__process.is_alive():
+            self.__process.terminate()
+            self.__process.join()
+
+    def snapshot(self) -> Snapshot:
+        '''Returns the latest snapshot of the followed simulation,
+        returns None if no complete snapshot is available
+        '''
+        return self.__snapshots.read()
+
+    @property
+    def started(self) -> bool:
+        return self.__process.is_alive()
+
+    @staticmethod
+    def run(population_size: int, configuration: dict, dimensions: dict[str, list[tuple[int, int]]],
+            shared, commands: mp.Queue) -> None:
+        '''Entry point of the training process
+        :param population_size: size of the genetic algorithm population
+        :param configuration: the values of the constants by their names
+        :param dimensions: the dimensions of each sprite in the game
+        :param shared: the shared buffer to publish snapshots to
+        :param commands: queue of commands sent by the viewer
+        '''
+
+        Reproduction.configure(configuration)
+        SpriteDimensions.dimensions.update(dimensions)
+
+        trainer = Trainer(population_size)
+        snapshots = SnapshotBuffer(shared, len(trainer.controller.player.ray_set))
+        paused = False
+
+        while True:
+            # Handle commands from the viewer, wait for one when paused
+            command = None
+            if paused:
+                command = commands.get()
+            elif not commands.empty():
+                try:
+                    command = commands.get_nowait()
+                except queue.Empty:
+                    pass
+
+            if command == 'stop':
+                trainer.population.close()
+                return
+            elif command == 'pause':
+                paused = True
+            elif command == 'resume':
+                paused = False
+            elif command == 'next':
+                trainer.next_player()
+
+            if not paused:
+                trainer.step()
+                snapshots.write(trainer)
@@ -0,0 +1,4 @@
+'''Standalone benchmarks for the game engine and the NEAT implementation.
+Every benchmark is a runnable module, for example:
+    python -m benchmarks.memory
+'''
@@ -0,0 +1,59 @@
+'''Compares the broad phases for projectile with asteroid collisions,
+scaling the amount of asteroids and projectiles to find where each one starts to pay off.
+Usage: python -m benchmarks.broad_phase
+'''
+
+from __future__ import annotations
+
+from benchmarks.common import setup, timeit, report
+
+import random
+
+
+def main() -> None:
+    setup()
+
+    from components.asteroid import Asteroid
+    from components.projectile import Projectile
+    from utils.geometry.collision import Hitbox
+    from utils.geometry.spatial_grid import SpatialGrid
+    from utils.constants import Constants
+
+    random.seed(0)
+    rows = [('asteroids', 'projectiles', 'brute (us)', 'sweep (us)', 'grid (us)', 'fastest')]
+    grid = SpatialGrid()
+
+    for asteroid_count in (4, 8, 16, 32, 64, 128, 256):
+        for projectile_count in (2, 8, 32, 128):
+            asteroids = [Asteroid(random.uniform(0, Constants.WINDOW_WIDTH),
+                                  random.uniform(0, Constants.WINDOW_HEIGHT),
+                                  hits=random.randint(0, 2)) for _ in range(asteroid_count)]
+            projectiles = [Projectile(random.uniform(0, Constants.WINDOW_WIDTH),
+                                      random.uniform(0, Constants.WINDOW_HEIGHT),
+                                      random.uniform(0, 6.28)) for _ in range(projectile_count)]
+
+            asteroid_hitboxes = [asteroid.hitbox for asteroid in asteroids]
+            projectile_hitboxes = [projectile.hitbox for projectile in projectiles]
+
+            def grid_phase() -> None:
+                # The grid is rebuilt every frame, so it is part of the cost
+                grid.rebuild(asteroids)
+                for hitbox in projectile_hitboxes:
+                    for asteroid in grid.query(hitbox):
+                        asteroid.hitbox.collides(hitbox)
+
+            times = {
+                'brute': timeit(lambda: Hitbox.colliding_pairs(projectile_hitboxes, asteroid_hitboxes), repeat=50),
+                'sweep': timeit(lambda: Hitbox.sweep_and_prune(projectile_hitboxes, asteroid_hitboxes), repeat=50),
+                'grid': timeit(grid_phase, repeat=50),
+            }
+
+            rows.append((asteroid_count, projectile_count,
+                         *(f'{t * 1e6:.1f}' for t in times.values()),
+                         min(times, key=times.get)))
+
+    report('Projectile with asteroid broad phase (best of 50 frames)', rows)
+
+
+if __name__ == '__main__':
+    main()
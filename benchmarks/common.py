@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from utils.geometry.collision import SpriteDimensions
+
+import os
+import time
+
+
+def load_sprite_dimensions() -> None:
+    '''Fills the sprite dimensions table without opening a window,
+    normally this is done by the game screen when it loads the sprites
+    '''
+
+    from os import environ
+    environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    SpriteDimensions.load()
+
+
+def setup(sprites: bool = True) -> None:
+    '''Prepares the environment for running a headless benchmark from the repository root
+    :param sprites: whether to load the sprite dimensions, which imports pygame
+    '''
+
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if not os.path.exists('data'):
+        os.mkdir('data')
+    if sprites:
+        load_sprite_dimensions()
+
+
+def timeit(func: callable, repeat: int = 1) -> float:
+    '''Returns the best wall-clock time of calling the given function, measured in seconds
+    :param func: the function to time
+    :param repeat: the number of times to call the function
+    '''
+
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(title: str, rows: list[tuple]) -> None:
+    '''Prints the results of a benchmark as an aligned table
+    :param title: the title of the table
+    :param rows: list of rows, the first row holds the column names
+    '''
+
+    widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+
+    print(title)
+    print('-' * (sum(widths) + 3 * (len(widths) - 1)))
+    for row in rows:
+        print('   '.join(str(cell).rjust(width) for cell, width in zip(row, widths)))
+    print()
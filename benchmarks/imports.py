@@ -0,0 +1,71 @@
+'''Measures the import time of the NEAT modules in a fresh interpreter,
+and the time it takes to spawn a worker process which imports them.
+The evolutionary core should import without the game or pygame.
+Usage: python -m benchmarks.imports [repeat]
+'''
+
+from __future__ import annotations
+
+from benchmarks.common import setup, timeit, report
+
+import multiprocessing as mp
+import subprocess
+import sys
+
+
+MODULES = ('NEAT.genome', 'NEAT.species', 'NEAT.population', 'NEAT.simulation', 'NEAT.trainer', 'NEAT.pop_screen')
+
+# Prints the import time of a module and which heavy dependencies it pulled in
+PROBE = '''
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, 'pygame' in sys.modules, 'src.model' in sys.modules)
+'''
+
+
+def probe(module: str) -> tuple[float, bool, bool]:
+    '''Imports a module in a fresh interpreter,
+    returns the import time and whether pygame and the game were imported
+    :param module: the name of the module
+    '''
+
+    output = subprocess.run([sys.executable, '-c', PROBE.format(module=module)],
+                            capture_output=True, text=True, check=True).stdout.split()
+    return float(output[0]), output[1] == 'True', output[2] == 'True'
+
+
+def worker(module: str) -> None:
+    '''Entry point of a spawned worker which only imports a module
+    :param module: the name of the module
+    '''
+    __import__(module)
+
+
+def spawn(module: str) -> None:
+    '''Spawns a worker process which imports a module and waits for it to exit
+    :param module: the name of the module
+    '''
+
+    process = mp.get_context('spawn').Process(target=worker, args=(module,))
+    process.start()
+    process.join()
+
+
+def main(repeat: int = 5) -> None:
+    setup(sprites=False)
+
+    rows = [('module', 'import ms', 'spawn worker ms', 'pygame', 'game')]
+    for module in MODULES:
+        results = [probe(module) for _ in range(repeat)]
+        seconds = min(result[0] for result in results)
+        _, pygame, game = results[0]
+        spawned = timeit(lambda: spawn(module), repeat)
+        rows.append((module, f'{seconds * 1000:.1f}', f'{spawned * 1000:.0f}',
+                     'yes' if pygame else 'no', 'yes' if game else 'no'))
+
+    report(f'Import time in a fresh interpreter (best of {repeat})', rows)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,56 @@
+'''Measures the memory footprint of a single simulation and a single genome,
+this decides how many simulations fit on a training worker.
+Usage: python -m benchmarks.memory [count]
+'''
+
+from __future__ import annotations
+
+from benchmarks.common import setup, report
+
+import gc
+import sys
+import tracemalloc
+
+
+def footprint(factory: callable, count: int) -> float:
+    '''Returns the average amount of bytes allocated by each object the factory creates
+    :param factory: function which creates a single object
+    :param count: the number of objects to create and keep alive
+    '''
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [factory() for _ in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del objects
+    return (after - before) / count
+
+
+def main(count: int = 200) -> None:
+    setup()
+
+    from NEAT.simulation import Simulation
+    from NEAT.genome import Genome
+    from utils.constants import Constants
+    from utils.geometry.vector import PositionVector, DirectionVector
+
+    inputs = Constants.RAY_AMOUNT * 2 + 1
+    rows = [('object', 'bytes each', 'objects per GiB')]
+
+    for name, factory in (
+        ('PositionVector', lambda: PositionVector(1, 2)),
+        ('DirectionVector', lambda: DirectionVector(1, 2)),
+        ('Genome', lambda: Genome(inputs, 4)),
+        ('Simulation', Simulation),
+    ):
+        size = footprint(factory, count)
+        rows.append((name, f'{size:,.0f}', f'{int(2 ** 30 / size):,}'))
+
+    report(f'Memory footprint (average of {count} objects)', rows)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
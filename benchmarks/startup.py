@@ -0,0 +1,49 @@
+'''Measures the cold start of the application, from importing the game to the first drawn menu frame,
+and how long each screen takes to build when it is first shown.
+Runs without a window unless SDL_VIDEODRIVER is set.
+Usage: python -m benchmarks.startup
+'''
+
+from __future__ import annotations
+
+from benchmarks.common import setup, report
+
+import os
+import time
+
+
+def main() -> None:
+    setup(sprites=False)
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+    start = time.perf_counter()
+    from src.asteroids_game import AsteroidsGame
+    imported = time.perf_counter()
+
+    game = AsteroidsGame()
+    built = time.perf_counter()
+
+    view = game.view
+    view.update()
+    interactive = time.perf_counter()
+
+    rows = [('stage', 'ms', 'total ms')]
+    for name, at, since in (
+        ('import', imported, start),
+        ('screen manager and menu', built, imported),
+        ('first menu frame', interactive, built),
+    ):
+        rows.append((name, f'{(at - since) * 1000:.0f}', f'{(at - start) * 1000:.0f}'))
+    report('Cold start to an interactive menu', rows)
+
+    # Build the rest of the screens, like the user would by visiting them
+    for name in ('instructions', 'game', 'demo-select', 'demo-config', 'topology-demo', 'population-demo'):
+        view.get_screen(name)
+
+    rows = [('screen', 'build ms')]
+    rows.extend((name, f'{seconds * 1000:.0f}') for name, seconds in view.build_times.items())
+    report('Screen build times', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+'''Compares the outcomes and the speed of episodes with discrete and swept collisions, at every training timestep.
+The same genomes play the same waves in each mode, the outcome of an episode matches
+the default mode (timestep 1 with discrete collisions) when its score is the same
+and its lifespan is the same up to a single step.
+Usage: python -m benchmarks.timestep [genomes]
+'''
+
+from __future__ import annotations
+
+from benchmarks.common import setup, timeit, report
+
+import random
+import sys
+
+
+def main(count: int = 40) -> None:
+    setup()
+
+    from NEAT.population import Population
+    from NEAT.simulation import Simulation
+    from utils.constants import Constants
+
+    defaults = {name: getattr(Constants, name) for name in ('TIMESTEP', 'SWEPT_COLLISIONS', 'EPISODE_MAX_FRAMES')}
+    Constants.EPISODE_MAX_FRAMES = 3000 # Keeps genomes which never die from dominating the run time
+
+    random.seed(0)
+    population = Population(count, seed=0)
+    brains = [sim.brain for sim in population.players]
+    population.close()
+
+    def play(timestep: int, swept: bool) -> tuple[list[tuple[int, int]], float]:
+        '''Plays every genome in the given mode, returns the score and the lifespan of each episode and the time it took'''
+
+        Constants.TIMESTEP, Constants.SWEPT_COLLISIONS = timestep, swept
+        outcomes: list[tuple[int, int]] = []
+
+        def run() -> None:
+            outcomes.clear()
+            for brain in brains:
+                sim = Simulation()
+                sim.brain = brain
+                sim.reset()
+                while not sim.dead:
+                    sim.update()
+                outcomes.append((sim.score, sim.lifespan))
+
+        return outcomes, timeit(run)
+
+    baseline, baseline_time = play(1, False)
+    rows = [('timestep', 'collisions', 'total score', 'same outcome', 'seconds', 'speedup')]
+
+    for timestep in (1, 2, 4):
+        for swept in (False, True):
+            outcomes, elapsed = (baseline, baseline_time) if (timestep, swept) == (1, False) else play(timestep, swept)
+            # A coarse timestep can only end an episode on a multiple of its frames
+            same = sum(score == expected_score and abs(lifespan - expected_lifespan) < timestep
+                       for (score, lifespan), (expected_score, expected_lifespan) in zip(outcomes, baseline))
+            rows.append((timestep, 'swept' if swept else 'discrete', sum(score for score, _ in outcomes),
+                         f'{same}/{count}', f'{elapsed:.2f}', f'{baseline_time / elapsed:.1f}x'))
+
+    for name, value in defaults.items():
+        setattr(Constants, name, value)
+
+    report(f'Episode outcomes of {count} genomes against timestep 1 with discrete collisions', rows)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
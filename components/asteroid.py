@@ -11,16 +11,17 @@ class Asteroid:
     :param x: X coordinate of the asteroid's position
     :param y: Y coordinate of the asteroid's position
     :param angle: direction angle of the asteroid, measured in radians
-    :param hits: number of hits took to split this asteroid (0 for default size)'''
+    :param hits: number of hits took to split this asteroid (0 for default size)
+    :param rng: the random number generator of the game, the global one by default'''
 
-    def __init__(self, x: float, y: float, angle: float = None, hits: int = 0) -> None:
+    def __init__(self, x: float, y: float, angle: float = None, hits: int = 0, rng: random.Random = None) -> None:
         self.__pos = PositionVector(x, y)
         self.__hits = hits
 
-        self.__hitbox = Hitbox(self.__pos, 'asteroid', Constants.ASTEROID_SPRITE_SCALE[self.__hits])
+        self.__hitbox = Hitbox(self.__pos, 'asteroid', Constants.ASTEROID_SPRITE_SCALE[self.__hits], rng)
 
         # Get a random angle for direction
-        self.__angle = random.uniform(0, math.pi * 2) if angle is None else angle
+        self.__angle = (rng or random).uniform(0, math.pi * 2) if angle is None else angle
 
         # Set velocity vector in that angle
         self.__vel = DirectionVector(
@@ -29,12 +30,10 @@ class Asteroid:
     def update(self, delta_time: float) -> None:
         '''Updates the asteroid
         :param delta_time: the time that has passed since last update, measured in seconds'''
-        self.__pos += self.__vel
+        # The position is shared with the hitbox and moved in place, by the number of frames that have passed
+        self.__pos.add_scaled(self.__vel, round(delta_time * Constants.FPS))
         self.__pos.handle_offscreen(self.__hitbox)
 
-        # Update hitbox position
-        self.__hitbox.pos = self.__pos
-
     @property
     def hitbox(self) -> Hitbox:
         return self.__hitbox
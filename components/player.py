@@ -35,22 +35,24 @@ class Player():
         self.__shoot_cooldown_dur = 0
 
         # AI
-        self.__ray_set = RaySet(self.__pos, self.__angle, Constants.RAY_AMOUNT)
+        self.__ray_set = RaySet(self.__pos, self.__angle, Constants.RAY_AMOUNT, self.__turn_speed)
 
     def update(self, delta_time: float) -> None:
         '''Updates the player
         :param delta_time: the time that has past since last update, measured in seconds
         '''
 
+        frames = round(delta_time * Constants.FPS) # Number of frames that have passed
+
         # Rotation
         if self.__rotating:
-            self.__set_rotation()
+            self.__set_rotation(frames)
 
         # Boost
         if self.__boosting:
-            self.boost()
+            self.boost(frames)
         else:
-            self.__slow_down()
+            self.__slow_down(frames)
 
         # Manage cooldowns
         if not self.__can_shoot:
@@ -60,26 +62,24 @@ class Player():
                 self.__can_shoot = True
                 self.__shoot_cooldown_dur = 0
 
-        # Move player
-        self.__pos += self.__vel
+        # Move player, the position is shared with the hitbox and the ray set
+        self.__pos.add_scaled(self.__vel, frames)
         self.__pos.handle_offscreen(self.__hitbox)
 
-        # Update hitbox position
-        self.__hitbox.pos = self.__pos
-
         # Update projectiles
-        self.__update_projectiles()
+        self.__update_projectiles(frames)
 
-        # Update ray set position
-        self.__ray_set.pos = self.__pos
+        # Update rays for the new position
+        self.__ray_set.update()
 
-    def __update_projectiles(self) -> None:
-        '''Updates all of the fired projectiles'''
+    def __update_projectiles(self, frames: int = 1) -> None:
+        '''Updates all of the fired projectiles
+        :param frames: the number of frames to move the projectiles by'''
         for projectile in reversed(self.__projectiles):
             if projectile.deleted:  # Remove deleted projectiles
                 self.__projectiles.remove(projectile)
             else:  # Update projectile if not deleted
-                projectile.update()
+                projectile.update(frames)
 
     def shoot(self) -> None:
         '''Fires a new projectile'''
@@ -93,20 +93,25 @@ class Player():
         self.__projectiles.append(Projectile(x, y, self.__angle))
         self.__can_shoot = False
 
-    def __set_rotation(self) -> None:
-        '''Sets the rotation of the player based on current speed and direction'''
-        self.__angle += self.__turn_speed * self.__rotate_dir
-        self.__ray_set.rotate(self.__turn_speed * self.__rotate_dir)
+    def __set_rotation(self, frames: int = 1) -> None:
+        '''Sets the rotation of the player based on current speed and direction
+        :param frames: the number of frames to rotate for'''
+        self.__angle += self.__turn_speed * self.__rotate_dir * frames
+        self.__ray_set.turn(self.__rotate_dir * frames)
 
-    def boost(self) -> None:
-        '''Boosts the player once'''
+    def boost(self, frames: int = 1) -> None:
+        '''Boosts the player once
+        :param frames: the number of frames to boost for'''
         self.__vel.angle = self.__angle
-        self.__vel.lerp_mag(-Constants.PLAYER_BOOST_SPEED,
-                            Constants.PLAYER_AIR_FRICTION)
+        for _ in range(frames):
+            self.__vel.lerp_mag(-Constants.PLAYER_BOOST_SPEED,
+                                Constants.PLAYER_AIR_FRICTION)
 
-    def __slow_down(self) -> None:
-        '''Slows down the player untill full stop'''
-        self.__vel.lerp_mag(0, Constants.PLAYER_AIR_FRICTION)
+    def __slow_down(self, frames: int = 1) -> None:
+        '''Slows down the player untill full stop
+        :param frames: the number of frames to slow down for'''
+        for _ in range(frames):
+            self.__vel.lerp_mag(0, Constants.PLAYER_AIR_FRICTION)
 
     def start_boost(self) -> None:
         '''Starts boosting the player'''
@@ -122,11 +127,12 @@ class Player():
         self.__rotating = True
         self.__rotate_dir = dir
 
-    def rotate(self, dir: int) -> None:
+    def rotate(self, dir: int, frames: int = 1) -> None:
         '''Rotates the player once
-        :param dir: direction of rotation (1 for anti-clockwizr, -1 for clockwize)'''
-        self.__angle += self.__turn_speed * dir
-        self.__ray_set.rotate(self.__turn_speed * dir)
+        :param dir: direction of rotation (1 for anti-clockwizr, -1 for clockwize)
+        :param frames: the number of frames to rotate for'''
+        self.__angle += self.__turn_speed * dir * frames
+        self.__ray_set.turn(dir * frames)
 
     def stop_rotate(self) -> None:
         '''Stops rotating the player'''
@@ -161,6 +167,10 @@ class Player():
     def angle_radians(self) -> float:
         return self.__angle
     
+    @property
+    def velocity(self) -> DirectionVector:
+        return self.__vel
+
     @property
     def boosting(self) -> bool:
         return self.__boosting
\ No newline at end of file
@@ -28,13 +28,14 @@ class Projectile:
         '''Deletes this projectile, as it is "dead"'''
         self.__deleted = True
 
-    def update(self) -> None:
-        '''Updates the projectile'''
-        self.__pos += self.__vel
+    def update(self, frames: int = 1) -> None:
+        '''Updates the projectile
+        :param frames: the number of frames to move by'''
+        # The position is shared with the hitbox and moved in place
+        self.__pos.add_scaled(self.__vel, frames)
         self.__pos.handle_offscreen(self.__hitbox)
 
-        self.__hitbox.pos = self.__pos  # Update sprite position
-        self.__distance_traveled += Constants.PROJECTILE_SPEED  # Add travel distance
+        self.__distance_traveled += Constants.PROJECTILE_SPEED * frames  # Add travel distance
 
         # Delete projectile if traveled too much
         if self.__distance_traveled >= self.__max_distance:
@@ -52,6 +53,10 @@ class Projectile:
     def angle(self) -> float:
         return -(int(math.degrees(self.__angle)) - 90) % 360
 
+    @property
+    def velocity(self) -> DirectionVector:
+        return self.__vel
+
     @property
     def alpha(self) -> int:
         return int(255 * (1 - self.__distance_traveled / self.__max_distance))
@@ -16,17 +16,20 @@ class AsteroidsGame:
 
     def __init__(self) -> None:
         # Create the screen manager
-        self.__view = ScreenManager(Constants.WINDOW_WIDTH, Constants.WINDOW_HEIGHT, Constants.FPS)
-        # Initialize the screens
-        self.__view.init_screen(GameScreen(), 'game')
-        self.__view.init_screen(InstructionsScreen(), 'instructions')
-        self.__view.init_screen(PopulationScreen(), 'population-demo')
-        self.__view.init_screen(DemoScreen(), 'topology-demo')
-        self.__view.init_screen(MenuScreen(), 'menu')
-        self.__view.init_screen(DemoSelectScreen(), 'demo-select')
-        self.__view.init_screen(DemoConfigScreen(), 'demo-config')
+        self.__view = ScreenManager(Constants.WINDOW_WIDTH, Constants.WINDOW_HEIGHT, Constants.FPS, Constants.DIRTY_RECTS)
+        # Register the screens, each screen is only built when it is first shown
+        self.__view.init_screen(GameScreen, 'game')
+        self.__view.init_screen(InstructionsScreen, 'instructions')
+        self.__view.init_screen(PopulationScreen, 'population-demo')
+        self.__view.init_screen(DemoScreen, 'topology-demo')
+        self.__view.init_screen(MenuScreen, 'menu')
+        self.__view.init_screen(DemoSelectScreen, 'demo-select')
+        self.__view.init_screen(DemoConfigScreen, 'demo-config')
         # Set the menu screen as default
         self.__view.set_screen('menu')
 
     def start(self) -> None:
-        self.__view.start()
\ No newline at end of file
+        self.__view.start()
+    @property
+    def view(self) -> ScreenManager:
+        return self.__view
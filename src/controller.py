@@ -17,10 +17,11 @@ class Controller:
     def __init__(self, ai: bool = False) -> None:
         self.__model = Model(ai=ai)
 
-    def update(self) -> None:
-        '''Updates the game model'''
+    def update(self, frames: int = 1) -> None:
+        '''Updates the game model
+        :param frames: the number of frames to advance the game by'''
         if not self.__model.paused:
-            self.__model.update(1 / Constants.FPS)
+            self.__model.update(frames / Constants.FPS)
 
     def toggle_pause(self) -> None:
         '''Toggles between play/pause'''
@@ -51,6 +52,14 @@ class Controller:
         '''Makes the vision list and acts according to the neural network predictions'''
         self.__model.think()
 
+    def act(self) -> None:
+        '''Repeats the last actions of the neural network without querying it'''
+        self.__model.act()
+
+    def release(self) -> None:
+        '''Frees the memory of the model which is only used while it is updated'''
+        self.__model.release()
+
     def dump_highscore(self) -> None:
         '''Saves the model's highscore to a file'''
         self.__model.dump_highscore()
@@ -134,4 +143,16 @@ class Controller:
     @score.setter
     def score(self, score: int) -> None:
         self.__model.score = score
+
+    @shots_fired.setter
+    def shots_fired(self, shots_fired: float) -> None:
+        self.__model.shots_fired = shots_fired
+
+    @shots_hit.setter
+    def shots_hit(self, shots_hit: float) -> None:
+        self.__model.shots_hit = shots_hit
+
+    @lifespan.setter
+    def lifespan(self, lifespan: int) -> None:
+        self.__model.lifespan = lifespan
         
\ No newline at end of file
@@ -1,11 +1,17 @@
 from __future__ import annotations
 from functools import lru_cache
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from components.projectile import Projectile
 
 from components.player import Player
 from components.asteroid import Asteroid
 
 from utils.constants import Constants
 from utils.geometry.vector import PositionVector
+from utils.geometry.spatial_grid import SpatialGrid
+from utils.geometry.collision import Hitbox, SweptHitbox
 
 from NEAT.genome import Genome
 
@@ -29,6 +35,8 @@ class Model:
         # Initialize astroids
         self.__asteroid_amount = 4
         self.__asteroids: list[Asteroid] = []
+        self.__grid: SpatialGrid = None # Only allocated while the game is updated
+        self.__random: random.Random = None # Made on its first use, see generator
         self.__spawn_asteroids()
 
         # Score system
@@ -55,17 +63,29 @@ class Model:
         self.__shots_hit = 1
         self.__lifespan = 0
         self.__dead = False
+        self.__actions = (False, 0, False) # Boost, rotation direction and shoot, held untill the next decision
+        self.__frames = 1 # Number of frames passed in the last update
 
         if self.__ai_training: # Generate neural network only if AI is true
             self.__brain = Genome(Constants.RAY_AMOUNT * 2 + 1, 4)
+            self.__legacy_vision = False
         else: # Else load pre-trained model
             self.__brain = Genome.load('data/brain_data.json')
+            # The pre-trained model expects the vision it was trained with
+            self.__legacy_vision = Constants.LEGACY_RAY_HITS
 
     def update(self, delta_time: float) -> None:
         '''Updates the game data
         :param delta_time: the time that has passed since last update, measured in seconds
         '''
 
+        self.__frames = round(delta_time * Constants.FPS)
+
+        # Allocate the spatial grid on the first update
+        if self.__grid is None and Constants.SPATIAL_GRID:
+            self.__grid = SpatialGrid()
+            self.__grid.rebuild(self.__asteroids)
+
         # Make AI move
         if self.__ai_playing:
             self.think()
@@ -77,60 +97,109 @@ class Model:
         for asteroid in self.__asteroids:
             asteroid.update(delta_time)
 
+        # Place the moved asteroids in the spatial grid
+        if self.__grid is not None:
+            self.__grid.rebuild(self.__asteroids)
+
         # Sprite Collisions
         self.handle_collisions()
         
-        # Add frame to lifespan
-        self.__lifespan += 1
+        # Add frames to lifespan
+        self.__lifespan += self.__frames
 
     def handle_collisions(self) -> None:
-        '''Handles collisions between every game component'''
+        '''Handles collisions between every game component.
+        Projectiles hit asteroids from the newest projectile to the oldest, so the asteroids split
+        by a newer projectile can be hit by the older projectiles in the same frame
+        '''
 
         # Asteroid with projectile collision
-        for projectile in reversed(self.__player.projectiles):
-            for asteroid in reversed(self.__asteroids):
-                # Check for any projectile with astroid collision
-                if asteroid.hitbox.collides(projectile.hitbox):
-                    self.__shots_hit += 1
-
-                    if asteroid.hits < Constants.ASTEROID_HITS - 1:
-                        # Split asteroids into two parts
-                        random_angle = random.uniform(-math.pi * .5, math.pi * .5)
-                        self.__asteroids.append(Asteroid(
-                            asteroid.x, asteroid.y,
-                            random_angle,
-                            asteroid.hits + 1))
-
-                        # 180 degrees angle from first split
-                        self.__asteroids.append(Asteroid(
-                            asteroid.x, asteroid.y,
-                            random_angle + math.pi,
-                            asteroid.hits + 1))
-
-                    # Add points to score
-                    self.__score += Constants.SCORE_SYSTEM[asteroid.hits]
-
-                    # High score beat
-                    if self.__score > self.__high_score \
-                        and not self.__ai_playing and not self.__ai_training:
-                        self.__high_score = self.__score
-
-                    # Delete old asteroid
-                    self.__asteroids.remove(asteroid)
-
-                    # Delete the projectile that hit the astroid
-                    projectile.delete()
-
-                    # Respawn asteroids if none exist
-                    if len(self.__asteroids) == 0:
-                        self.__asteroid_amount += 1
-                        self.__spawn_asteroids()
+        projectiles = self.__player.projectiles
+        destroyed: dict[Asteroid, None] = {} # Ordered set of the asteroids that were hit
+        splits: list[Asteroid] = []
+
+        # The asteroids each projectile collides with, from the newest asteroid to the oldest
+        hits: dict[int, list[Asteroid]] = {}
+        for projectile_index, asteroid_index in self.__projectile_hits():
+            hits.setdefault(projectile_index, []).append(self.__asteroids[asteroid_index])
+
+        for projectile_index in range(len(projectiles) - 1, -1, -1) if hits else ():
+            projectile = projectiles[projectile_index]
+
+            # The splits of this frame are the newest asteroids, they have not moved yet
+            targets = [split for split in reversed(splits) if split.hitbox.collides(projectile.hitbox)]
+            targets += hits.get(projectile_index, [])
+
+            for asteroid in targets:
+                # The asteroid was already hit by another projectile
+                if asteroid in destroyed:
+                    continue
+
+                self.__shots_hit += 1
+
+                if asteroid.hits < Constants.ASTEROID_HITS - 1:
+                    # Split asteroids into two parts
+                    rng = self.generator()
+                    random_angle = rng.uniform(-math.pi * .5, math.pi * .5)
+                    splits.append(Asteroid(
+                        asteroid.x, asteroid.y,
+                        random_angle,
+                        asteroid.hits + 1, rng))
+
+                    # 180 degrees angle from first split
+                    splits.append(Asteroid(
+                        asteroid.x, asteroid.y,
+                        random_angle + math.pi,
+                        asteroid.hits + 1, rng))
+
+                # Add points to score
+                self.__score += Constants.SCORE_SYSTEM[asteroid.hits]
+
+                # High score beat
+                if self.__score > self.__high_score \
+                    and not self.__ai_playing and not self.__ai_training:
+                    self.__high_score = self.__score
+
+                # Mark old asteroid for deletion
+                destroyed[asteroid] = None
+
+                # Delete the projectile that hit the astroid
+                projectile.delete()
+
+        if destroyed:
+            # Delete old asteroids in a single pass and add the splits which were not hit
+            added = [split for split in splits if split not in destroyed]
+            self.__asteroids[:] = [asteroid for asteroid in self.__asteroids if asteroid not in destroyed]
+            self.__asteroids.extend(added)
+
+            if self.__grid is not None:
+                for asteroid in destroyed:
+                    if asteroid not in splits: # Splits of this frame were never placed in the grid
+                        self.__grid.remove(asteroid)
+                for asteroid in added:
+                    self.__grid.insert(asteroid)
+
+            # Respawn asteroids if none exist
+            if len(self.__asteroids) == 0:
+                self.__asteroid_amount += 1
+                self.__spawn_asteroids()
 
         # Asteroid with player collision
-        if any(asteroid.hitbox.collides(self.__player.hitbox) for asteroid in self.__asteroids):
+        if Constants.SWEPT_COLLISIONS:
+            hitbox = SweptHitbox(self.__player.hitbox, *self.__displacement(self.__player),
+                                 max(Constants.ASTEROID_VELOCITY) * self.__frames)
+            nearby = self.__asteroids if self.__grid is None else self.__grid.query(hitbox)
+            collided = any(hitbox.hits(asteroid.hitbox, *self.__displacement(asteroid)) for asteroid in nearby)
+        else:
+            nearby = self.__asteroids if self.__grid is None else self.__grid.query(self.__player.hitbox)
+            collided = any(asteroid.hitbox.collides(self.__player.hitbox) for asteroid in nearby)
+
+        if collided:
             self.__dead = True
-            
-            if not self.__ai_training:
+
+            if self.__ai_training:
+                self.release()
+            else:
                 # Proceed to next life cycle
                 self.__lives -= 1
                 if self.__lives > 0:
@@ -140,39 +209,95 @@ class Model:
                     self.__game_over = True
                     self.__paused = True
 
+    def __projectile_hits(self) -> list[tuple[int, int]]:
+        '''Returns the (projectile index, asteroid index) pairs of every projectile colliding with an asteroid,
+        using the broad phase set in Constants.COLLISION_BROAD_PHASE.
+        The pairs are sorted from the newest projectile and asteroid to the oldest
+        '''
+
+        projectiles = self.__player.projectiles
+        if len(projectiles) == 0:
+            return []
+
+        if Constants.SWEPT_COLLISIONS:
+            # The broad phase finds the asteroids near the path of each projectile,
+            # the asteroids may have moved towards it during the step as well
+            margin = max(Constants.ASTEROID_VELOCITY) * self.__frames
+            projectile_hitboxes = [SweptHitbox(projectile.hitbox, *self.__displacement(projectile), margin)
+                                   for projectile in projectiles]
+        else:
+            projectile_hitboxes = [projectile.hitbox for projectile in projectiles]
+
+        if Constants.COLLISION_BROAD_PHASE == 'grid' and self.__grid is not None:
+            indices = {asteroid: i for i, asteroid in enumerate(self.__asteroids)}
+            pairs = [(i, indices[asteroid])
+                     for i, hitbox in enumerate(projectile_hitboxes)
+                     for asteroid in self.__grid.query(hitbox)
+                     if asteroid.hitbox.collides(hitbox)]
+        else:
+            asteroid_hitboxes = [asteroid.hitbox for asteroid in self.__asteroids]
+            if Constants.COLLISION_BROAD_PHASE == 'sweep':
+                pairs = Hitbox.sweep_and_prune(projectile_hitboxes, asteroid_hitboxes)
+            else:
+                pairs = Hitbox.colliding_pairs(projectile_hitboxes, asteroid_hitboxes)
+
+        if Constants.SWEPT_COLLISIONS:
+            pairs = [(i, j) for i, j in pairs if projectile_hitboxes[i].hits(
+                self.__asteroids[j].hitbox, *self.__displacement(self.__asteroids[j]))]
+
+        pairs.sort(reverse=True)
+        return pairs
+
+    def __displacement(self, component: Player | Asteroid | Projectile) -> tuple[float, float]:
+        '''Returns the distance the given component moved in the last update
+        :param component: the moving component
+        '''
+
+        velocity = component.velocity
+        return velocity.x * self.__frames, velocity.y * self.__frames
+
     def think(self) -> int:
         '''Makes the vision list and acts according to the neural network predictions'''
 
-        vision = self.__player.ray_set.cast(self.__asteroids)
+        vision = self.__player.ray_set.cast(self.__asteroids, self.__grid, self.__legacy_vision)
         vision.append(int(self.__player.can_shoot and vision[0] != 0))
         results = self.__brain.feed_forward(vision)
-        
-        if results[0] > .8:
-            self.__player.boost()
 
-        if results[1] > .8: 
-            self.__player.rotate(1)
-        elif results[2] > .8:
-            self.__player.rotate(-1)
+        rotation = 1 if results[1] > .8 else -1 if results[2] > .8 else 0
+        self.__actions = (results[0] > .8, rotation, results[3] > .8)
+        self.act()
+
+    def act(self) -> None:
+        '''Repeats the last actions decided by the neural network'''
+
+        boost, rotation, shoot = self.__actions
+
+        # The actions last for every frame of the update
+        if boost:
+            self.__player.boost(self.__frames)
 
-        if results[3] > .8:
+        if rotation != 0:
+            self.__player.rotate(rotation, self.__frames)
+
+        if shoot:
             self.__player.shoot()
             self.__shots_fired += 1
     
     @staticmethod
-    def generate_asteroid() -> Asteroid:
-        '''Generates a random asteroid'''
+    def generate_asteroid(rng: random.Random) -> Asteroid:
+        '''Generates a random asteroid
+        :param rng: the random number generator to generate the asteroid by'''
 
         spawn_gap = 50
 
         # Inside screen
-        x = random.uniform(-Constants.WINDOW_WIDTH * .5, Constants.WINDOW_WIDTH * 1.5)
+        x = rng.uniform(-Constants.WINDOW_WIDTH * .5, Constants.WINDOW_WIDTH * 1.5)
         x_inside = x > spawn_gap and x < Constants.WINDOW_WIDTH - spawn_gap
 
-        y = random.choice([random.uniform(-spawn_gap * 2, -spawn_gap),  # Below screen
+        y = rng.choice([rng.uniform(-spawn_gap * 2, -spawn_gap),  # Below screen
                     # Above screen
-                   random.uniform(spawn_gap, spawn_gap * 2) + Constants.WINDOW_HEIGHT]) if x_inside \
-            else random.uniform(spawn_gap, Constants.WINDOW_HEIGHT - spawn_gap)  # Inside sreen
+                   rng.uniform(spawn_gap, spawn_gap * 2) + Constants.WINDOW_HEIGHT]) if x_inside \
+            else rng.uniform(spawn_gap, Constants.WINDOW_HEIGHT - spawn_gap)  # Inside sreen
 
         # Pick a random point on screen
         random_point = PositionVector(Constants.WINDOW_WIDTH * .5, Constants.WINDOW_HEIGHT * .5)
@@ -180,7 +305,7 @@ class Model:
         # Get the angle between asteroid's position and random point
         angle = PositionVector(x, y).angle_between(random_point)
 
-        return Asteroid(x, y, angle=angle)
+        return Asteroid(x, y, angle=angle, rng=rng)
 
     def __spawn_asteroids(self) -> None:
         '''Spawns new asteroids on screen'''
@@ -188,16 +313,22 @@ class Model:
         if self.__ai_training:
             self.__asteroids = copy.deepcopy(Model.generate_wave_by_seed(self.__seed, self.__asteroid_amount))
         else: 
-            self.__asteroids = [Model.generate_asteroid()
+            rng = self.generator()
+            self.__asteroids = [Model.generate_asteroid(rng)
                                 for _ in range(self.__asteroid_amount)]
 
+        if self.__grid is not None:
+            self.__grid.rebuild(self.__asteroids)
+
     @staticmethod
     @lru_cache(maxsize=1000)
     def generate_wave_by_seed(seed: int, length: int) -> None:
-        '''Generates a seeded wave of asteroids based on the wave length and seed value
+        '''Generates a seeded wave of asteroids based on the wave length and seed value.
+        The wave only depends on its seed and length, so the cached waves can be shared by every population
         :param seed: the seed in which to generate the wave by
         :param length: the wave length of the asteroids'''
-        return [Model.generate_asteroid() for _ in range(length)]
+        rng = random.Random(f'wave {seed} {length}')
+        return [Model.generate_asteroid(rng) for _ in range(length)]
 
     def toggle_pause(self) -> None:
         '''Toggles between play/pause'''
@@ -208,9 +339,28 @@ class Model:
         with open('data/game_data.json', 'w') as f:
             f.write(json.dumps({ 'highscore': self.__high_score }))
 
+    def generator(self) -> random.Random:
+        '''Returns the random number generator of the game, made on its first use.
+        A training episode only depends on the brain and the seed, so it is seeded by the seed,
+        other games get a new unseeded generator
+        '''
+
+        if self.__random is None:
+            self.__random = random.Random(f'episode {self.__seed}') if self.__ai_training else random.Random()
+        return self.__random
+
+    def release(self) -> None:
+        '''Frees the memory which is only used while the game is updated, such as the spatial grid
+        and the random number generator. The next update allocates them again
+        '''
+        self.__grid = None
+        self.__random = None
+
     def reset(self, true_reset: bool = True) -> None:
         '''Resets all of the data of the game'''
 
+        self.release()
+
         # Reset player
         self.__player = Player(Constants.WINDOW_WIDTH * 0.5, Constants.WINDOW_HEIGHT * 0.5)
 
@@ -233,6 +383,7 @@ class Model:
         self.__shots_hit = 1
         self.__lifespan = 0
         self.__dead = False
+        self.__actions = (False, 0, False)
 
     @property
     def player(self) -> Player:
@@ -297,6 +448,7 @@ class Model:
     @brain.setter
     def brain(self, brain: Genome) -> None:
         self.__brain = brain
+        self.__legacy_vision = False
 
     @seed.setter
     def seed(self, seed: int) -> None:
@@ -308,4 +460,16 @@ class Model:
 
     @score.setter
     def score(self, score: int) -> None:
-        self.__score = score
\ No newline at end of file
+        self.__score = score
+
+    @shots_fired.setter
+    def shots_fired(self, shots_fired: int) -> None:
+        self.__shots_fired = shots_fired
+
+    @shots_hit.setter
+    def shots_hit(self, shots_hit: int) -> None:
+        self.__shots_hit = shots_hit
+
+    @lifespan.setter
+    def lifespan(self, lifespan: int) -> None:
+        self.__lifespan = lifespan
\ No newline at end of file
@@ -14,7 +14,7 @@ class DemoSelectScreen(Screen):
         self.__topology_button = Button(self, 0, 400, 400, 100, (255, 255, 255), 'Topology Demo')
         self.__population_button = Button(self, 0, 600, 400, 100, (255, 255, 255), 'Training Demo')
 
-        self.__back_image = Image('assets/sprites/back.png')
+        self.__back_image = Image.load('assets/sprites/back.png')
 
         self.__animations: dict[str, int] = {}
         self.reset_animations()
@@ -3,13 +3,14 @@ from __future__ import annotations
 from utils.constants import Constants
 from utils.geometry.raycasting import RaySet
 from utils.geometry.collision import SpriteDimensions, Hitbox
-from utils.drawing import Button, Screen, Image
+from utils.drawing import Button, Screen, Image, RotationAtlas
 
 from components.player import Player
 from components.asteroid import Asteroid
 
 from src.controller import Controller
 
+import pygame as pg
 import random
 import math
 
@@ -21,15 +22,15 @@ class GameScreen(Screen):
         super().__init__(Constants.WINDOW_WIDTH, Constants.WINDOW_HEIGHT, Constants.WINDOW_TITLE)
         
         self.__sprites = {
-            'asteroid': [Image(f'assets/sprites/asteroid{i}.png') for i in range(1, 4)],
-            'player': [Image('assets/sprites/player.png')],
-            'projectile': [Image('assets/sprites/projectile.png')]
+            'asteroid': [Image.load(f'assets/sprites/asteroid{i}.png') for i in range(1, 4)],
+            'player': [Image.load('assets/sprites/player.png')],
+            'projectile': [Image.load('assets/sprites/projectile.png')]
         }
 
         self.__title_font = self.load_font('assets/fonts/HyperspaceBold.ttf', 100)
         self.__button_font = self.load_font('assets/fonts/HyperspaceBold.ttf', 50)
-        self.__pause_image = Image('assets/sprites/pause.png')
-        self.__resume_image = Image('assets/sprites/resume.png')
+        self.__pause_image = Image.load('assets/sprites/pause.png')
+        self.__resume_image = Image.load('assets/sprites/resume.png')
 
         self.__pause_pos = (self.width - 100, 50)
         self.__pause_dims = (50, 50)
@@ -46,15 +47,43 @@ class GameScreen(Screen):
             dims = [image.size for image in images]
             SpriteDimensions.dimensions[sprite] = dims
 
+        # Pre-rotate every sprite in every scale it can be drawn in, so drawing never rotates
+        self.__rotation_steps = {
+            'asteroid': Constants.ASTEROID_ROTATION_STEPS,
+            'player': Constants.ROTATION_STEPS,
+            'projectile': Constants.ROTATION_STEPS,
+        }
+        scales = {
+            'asteroid': Constants.ASTEROID_SPRITE_SCALE,
+            'player': (Constants.PLAYER_SPRITE_SCALE,),
+            'projectile': (Constants.PROJECTILE_SPRITE_SCALE,),
+        }
+
+        for sprite, images in self.__sprites.items():
+            for image in images:
+                for scale in scales[sprite]:
+                    w, h = image.size
+                    RotationAtlas.load(image, int(w * scale), int(h * scale), self.__rotation_steps[sprite])
+        RotationAtlas.load(self.__thrust_image, *self.__thrust_image.size, Constants.ROTATION_STEPS)
+
         self.__controller = Controller()
 
         # Graphical setup
         self.no_stroke()
 
         # Generate stars for background
-        self.__stars = [(random.uniform(0, self.width),
-                         random.uniform(0, self.height),
-                         random.uniform(1, 3)) for _ in range(50)]
+        stars = [(random.uniform(0, self.width),
+                  random.uniform(0, self.height),
+                  random.uniform(1, 3)) for _ in range(50)]
+
+        # The background never changes, so it is drawn once
+        self.__background_surface = pg.Surface((self.width, self.height)).convert()
+        self.begin_draw(self.__background_surface)
+        self.background(0)
+        self.fill(255)
+        for x, y, size in stars:
+            self.circle(x, y, size)
+        self.end_draw()
 
         self.__score_font = self.load_font('assets/fonts/HyperspaceBold.ttf', 36)
 
@@ -146,14 +175,8 @@ class GameScreen(Screen):
 
     def draw_background(self) -> None:
         '''Draws the background, including the stars'''
-
-        # Clear screen to background color
-        self.background(0)
-
-        # Draw stars
+        self.restore_background(self.__background_surface)
         self.fill(255)
-        for x, y, size in self.__stars:
-            self.circle(x, y, size)
 
     def draw_sprites(self, player: Player, asteroids: list[Asteroid]) -> None:
         '''Draws the player and the asteroid sprites on the screen
@@ -188,7 +211,7 @@ class GameScreen(Screen):
             x = player.hitbox.pos.x + r * math.cos(player.angle_radians)
             y = player.hitbox.pos.y + r * math.sin(player.angle_radians)
 
-            thrust = Image.rotate(self.__thrust_image, player.angle)
+            thrust = RotationAtlas.load(self.__thrust_image, *self.__thrust_image.size, Constants.ROTATION_STEPS).get(player.angle)
             self.image(thrust, *thrust.get_rect((x, y)))
 
     def draw_score(self, score: int, high_score: int = None, lives: int = None) -> None:
@@ -258,12 +281,11 @@ class GameScreen(Screen):
         :param alpha: the opacity for the sprite'''
 
         raw_image = self.__sprites[component][hitbox.index]
-        image = Image.rotate(Image.resize(raw_image, hitbox.width, hitbox.height), angle)
+        steps = self.__rotation_steps[component]
+        image = RotationAtlas.load(raw_image, hitbox.width, hitbox.height, steps).get(angle)
 
-        temp = image.alpha
-        image.alpha = alpha
-        self.image(image, *image.get_rect(tuple(hitbox.pos)))
-        image.alpha = temp # Revert to normal opacity to prevent affecting cached images
+        # Atlas images are shared, so faded sprites are drawn from a copy
+        self.image(image, *image.get_rect(tuple(hitbox.pos)), alpha=None if alpha == 255 else alpha)
 
     def draw_rays(self, ray_set: RaySet) -> None:
         '''Draws the vision rays on screen'''
@@ -20,7 +20,7 @@ class InstructionsScreen(Screen):
         self.__key_off_x = self.__empty_key.size[0] * .5
         self.__key_off_y = self.__empty_key.size[1] * .5
 
-        self.__back_image = Image('assets/sprites/back.png')
+        self.__back_image = Image.load('assets/sprites/back.png')
 
         # Draw once
         self.draw_text()
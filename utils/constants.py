@@ -28,16 +28,59 @@ class Constants:
     PROJECTILE_SPEED = 45
     SHOOT_COOLDOWN = .4  # Seconds
 
+    # Spatial grid used for collisions and ray casting
+    SPATIAL_GRID = True
+    GRID_CELL_SIZE = 100
+
+    # Test the whole path each sprite moved along in an update, so fast projectiles cannot pass through asteroids.
+    # Changes the outcome of collisions, meant for training with a coarse TIMESTEP
+    SWEPT_COLLISIONS = False
+
+    # Broad phase for projectile collisions: 'grid', 'sweep' (sweep and prune) or 'brute'
+    COLLISION_BROAD_PHASE = 'grid'
+
     # Score
     SCORE_SYSTEM = (20, 50, 100)
 
     # Neural Network and Training parameters
     TRAINING = False
     RAY_AMOUNT = 16
+    LEGACY_RAY_HITS = True  # data/brain_data.json was trained when the redshift of every ray came from the last asteroid instead of the hit one
     POPULATION_SIZE = 300
     BATCH_SIZE = 50
     ITERATIONS = 1
+    ACTION_REPEAT = 1  # Steps each decision of the network is held for, the network is queried once every this many steps
+    TIMESTEP = 1  # Game frames advanced by each training step, 2 or 4 train faster with coarser physics
+    WEIGHT_MUTATION_CHANCE = .8
+    CONNECTION_MUTATION_CHANCE = .05
+    NODE_MUTATION_CHANCE = .03
+    EXCESS_COEFFICIENT = 1.5  # Compatibility of genomes in the same species
+    WEIGHT_DIFFERENCE_COEFFICIENT = .8
+    COMPATIBILITY_THRESHOLD = 2
+    STALE_GENERATIONS = 15  # Species which have not improved for this many generations are killed
+    REPRODUCTION_WORKERS = 0  # Processes breeding the children of each generation, 0 breeds them in the training process
+
+    # Episode budget of each simulation, None disables a limit
+    EPISODE_MAX_FRAMES = None  # Frames before the episode is cut, 9000 is 5 minutes of game time
+    EPISODE_SCORELESS_FRAMES = None  # Frames without scoring before the episode is cut
+    EPISODE_TIME_LIMIT = None  # Seconds, wall-clock limits make training runs irreproducible
+    EVALUATION_CACHE_SIZE = 1000  # Finished episodes of the current generation remembered by each population, 0 disables the cache
+
+    # Island model, populations evolving in separate processes
+    ISLANDS = 4
+    MIGRATION_INTERVAL = 5  # Generations between migrations
+    MIGRANTS = 2  # Champions each island sends to every island it is connected to
+    MIGRATION_TOPOLOGY = 'ring'  # 'ring' (to the next island) or 'all' (to every other island)
+
+    # Training viewer
+    BACKGROUND_TRAINING = True  # Train in a separate process, the viewer only draws its snapshots
+    SIMULATION_BUDGET = .03  # Seconds of training per drawn frame, when training in the render loop
+    TURBO_RENDER_INTERVAL = 10  # Draw once every this many frames in turbo mode
+    TRAINING_STOP_TIMEOUT = 5  # Seconds to wait for the training process to stop before terminating it
 
     # GRAPHICS
     TEXT_COLOR = (240, 240, 192)
     BACK_RECT = (10, 10, 60, 60)
+    ROTATION_STEPS = 360  # Pre-rotated copies of each sprite in a full turn
+    DIRTY_RECTS = False  # Only update the regions of the display that were drawn on
+    ASTEROID_ROTATION_STEPS = 72  # Asteroids never turn, so their random headings are drawn at 5 degree steps
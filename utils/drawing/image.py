@@ -14,6 +14,14 @@ class Image:
         base_image = image if isinstance(image, pg.Surface) else pg.image.load(image) # Load image
         self.__surface = base_image.convert_alpha() # The surface used for viewing
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def load(image_path: str) -> Image:
+        '''Returns the image of the given file, each file is only loaded once.
+        The loaded images are shared by every screen, so images made from them are cached for every screen too
+        :param image_path: path to image file'''
+        return Image(image_path)
+
     @staticmethod
     @lru_cache(maxsize=1000)
     def resize(image: Image, width: int, height: int, smooth: bool = True) -> Image:
@@ -46,7 +54,7 @@ class Image:
         :param image_path: path to image file
         :param scale: the scale of the loaded image'''
 
-        original = Image(image_path)
+        original = Image.load(image_path)
         size = tuple(int(d * scale) for d in original.size)
         return Image.resize(original, *size, smooth=False)
 
@@ -69,4 +77,36 @@ class Image:
 
     @alpha.setter
     def alpha(self, alpha: int) -> None:
-        self.__surface.set_alpha(alpha)
\ No newline at end of file
+        self.__surface.set_alpha(alpha)
+
+class RotationAtlas:
+    '''Holds copies of an image rotated in evenly spaced angles,
+    so drawing a rotated image only takes a lookup instead of a rotation
+    :param image: the image to rotate
+    :param steps: the amount of rotated copies in a full turn
+    '''
+
+    def __init__(self, image: Image, steps: int = 360) -> None:
+        self.__steps = steps
+        self.__images = [Image(pg.transform.rotate(image.surface, i * 360 / steps)) for i in range(steps)]
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def load(image: Image, width: int, height: int, steps: int = 360) -> RotationAtlas:
+        '''Returns the rotation atlas of the given image resized to the given size,
+        each atlas is only made once and is never evicted, as the sprites are drawn every frame.
+        Images loaded by Image.load share their atlases between every screen
+        :param image: the original image
+        :param width: the width of the image before rotating
+        :param height: the height of the image before rotating
+        :param steps: the amount of rotated copies in a full turn'''
+        return RotationAtlas(Image.resize(image, width, height), steps)
+
+    def get(self, angle: float) -> Image:
+        '''Returns the copy closest to the given angle
+        :param angle: the angle of the image, measured in degrees'''
+        return self.__images[round(angle * self.__steps / 360) % self.__steps]
+
+    @property
+    def steps(self) -> int:
+        return self.__steps
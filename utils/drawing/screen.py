@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import pygame as pg
 from pygame.event import Event
+from functools import lru_cache
 
 from utils.drawing import Canvas, Image
 
@@ -14,12 +15,13 @@ class Screen:
     :param fps: the framee rate in which the screen is being updated
     '''
 
+    # Key names mapped to their pygame key codes, shared by every screen
+    __keys = {k[2:]: v for k, v in pg.constants.__dict__.items() if k.startswith('K_')}
+
     def __init__(self, width: float, height: float, title: str) -> None:
-        # Canvas and keys
+        # Canvas
         self.__title = title
         self.__canvas = Canvas(width, height)
-        
-        self.__keys = {k[2:]: v for k, v in pg.constants.__dict__.items() if k.startswith('K_')}
 
         # Drawing functions
         self.__display = self.__canvas.display
@@ -33,7 +35,34 @@ class Screen:
 
         self.__font_family = 'sans serif'
         self.__font_size = 100
-        self.__font = pg.font.SysFont(self.__font_family, self.__font_size)
+        self.__font = Screen.load_sys_font(self.__font_family, self.__font_size)
+
+        # Update and render rates
+        self.__update_budget: float = None # Seconds of updates per frame, None for a single update
+        self.__render_interval = 1 # Draw once every this many frames
+
+        # Dirty rectangles
+        self.__dirty_rects: list[pg.Rect] = [] # Regions drawn on since the last frame was shown
+        self.__drawn_rects: list[pg.Rect] = [] # Regions drawn on since the background was last restored
+        self.__background_surface: pg.Surface = None
+
+    def __mark(self, rect: pg.Rect) -> None:
+        '''Marks a region of the screen as drawn on,
+        drawings on off-screen surfaces are not marked
+        :param rect: the drawn region
+        '''
+
+        if self.__display is self.__canvas.display:
+            self.__dirty_rects.append(rect)
+            self.__drawn_rects.append(rect)
+
+    def __mark_all(self) -> None:
+        '''Marks the whole screen as drawn on, forgetting every smaller region'''
+
+        if self.__display is self.__canvas.display:
+            rect = self.__display.get_rect()
+            self.__dirty_rects = [rect]
+            self.__drawn_rects = [rect]
 
     def blur(self, alpha: int = 100) -> None:
         '''Darkens the screen by a given alpha value
@@ -44,6 +73,7 @@ class Screen:
         surf.fill((0, 0, 0))
         surf.set_alpha(alpha)
         self.__display.blit(surf, (0, 0))
+        self.__mark_all()
 
     def background(self, r: int, g: int = None, b: int = None) -> None:
         '''Draws a solid background on top of the previous drawings
@@ -57,6 +87,31 @@ class Screen:
         b = r if b is None else b
 
         self.__display.fill((r, g, b))
+        self.__mark_all()
+
+    def restore_background(self, surface: pg.Surface) -> None:
+        '''Draws a pre-rendered background of the screen's size.
+        Only the regions drawn on since the last restore are drawn again,
+        the rest of the screen already shows the background
+        :param surface: the background surface
+        '''
+
+        # A new background covers the whole screen
+        if surface is not self.__background_surface:
+            self.__background_surface = surface
+            self.__drawn_rects = [self.__display.get_rect()]
+
+        drawn, self.__drawn_rects = self.__drawn_rects, []
+        for rect in drawn:
+            self.__dirty_rects.append(self.__display.blit(surface, rect, rect))
+
+    def invalidate_background(self) -> None:
+        '''Forgets the restored background, so the next restore draws the whole screen again,
+        used when the screen is shown again after another screen was drawn on the display
+        '''
+
+        self.__background_surface = None
+        self.__drawn_rects = []
 
     def fill(self, r: int | tuple, g: int = None, b: int = None) -> None:
         '''Sets the fill color for drawing
@@ -113,11 +168,11 @@ class Screen:
         :param r: the radius of the circle'''
 
         if self.__filling:
-            pg.draw.circle(self.__display, self.__fill_color, (x, y), r)
+            self.__mark(pg.draw.circle(self.__display, self.__fill_color, (x, y), r))
 
         if self.__stroking:
-            pg.draw.circle(self.__display, self.__stroke_color,
-                           (x, y), r, self.__weight)
+            self.__mark(pg.draw.circle(self.__display, self.__stroke_color,
+                                       (x, y), r, self.__weight))
 
     def rect(self, x: float, y: float, w: float, h: float, round: int = 0) -> None:
         '''Draws a rectangle on the screen
@@ -129,11 +184,11 @@ class Screen:
         '''
 
         if self.__filling:
-            pg.draw.rect(self.__display, self.__fill_color, (x, y, w, h), border_radius=round)
+            self.__mark(pg.draw.rect(self.__display, self.__fill_color, (x, y, w, h), border_radius=round))
 
         if self.__stroking:
-            pg.draw.rect(self.__display, self.__stroke_color,
-                         (x, y, w, h), self.__weight, border_radius=round)
+            self.__mark(pg.draw.rect(self.__display, self.__stroke_color,
+                                     (x, y, w, h), self.__weight, border_radius=round))
 
     def image(self, image: Image, x: float, y: float, w: float = None, h: float = None, alpha: float = None, center: bool = False) -> None:
         '''Draws a given image on the screen
@@ -147,14 +202,35 @@ class Screen:
         to it's center point instead of the top left corner of the image
         '''
         
-        scale = (w, h) if w and h else image.size
+        # Scaled images are cached, most images are drawn in the same size every frame
+        if w and h and (w, h) != image.size:
+            image = Image.resize(image, w, h, smooth=False)
         
         if alpha is None:
-            self.__display.blit(pg.transform.scale(image.surface, scale), (x, y))
+            self.__mark(self.__display.blit(image.surface, (x, y)))
         else:
-            temp = image.__surface.copy()
+            temp = image.surface.copy()
             temp.set_alpha(alpha)
-            self.__display.blit(pg.transform.scale(temp, scale), (x, y))
+            self.__mark(self.__display.blit(temp, (x, y)))
+
+    def blit(self, surface: pg.Surface, x: float, y: float) -> None:
+        '''Draws a given surface on the screen without scaling it
+        :param surface: the surface to draw
+        :param x: the X coordinate of the top left corner of the surface
+        :param y: the Y coordinate of the top left corner of the surface
+        '''
+        self.__mark(self.__display.blit(surface, (x, y)))
+
+    def begin_draw(self, surface: pg.Surface) -> None:
+        '''Redirects every drawing function to the given surface untill end_draw is called,
+        used for rendering drawings off-screen once and blitting them on every frame
+        :param surface: the surface to draw on
+        '''
+        self.__display = surface
+
+    def end_draw(self) -> None:
+        '''Redirects the drawing functions back to the screen'''
+        self.__display = self.__canvas.display
 
     def text(self, text: str, x: float, y: float, center: bool = False) -> None:
         '''Draws the given text on the screen
@@ -165,14 +241,20 @@ class Screen:
         point instead of the top left corner of the text rectangle
         '''
 
-        text_surface = self.__font.render(text, True, self.__fill_color)
+        text_surface = Screen.render_text(self.__font, text, self.__fill_color)
 
         if center:
-            self.__display.blit(text_surface,
-                                text_surface.get_rect(center=(x, y)))
+            self.__mark(self.__display.blit(text_surface,
+                                            text_surface.get_rect(center=(x, y))))
         else:
-            self.__display.blit(text_surface,
-                                text_surface.get_rect(topleft=(x, y)))
+            self.__mark(self.__display.blit(text_surface,
+                                            text_surface.get_rect(topleft=(x, y))))
+
+    def text_size(self, text: str) -> tuple[int, int]:
+        '''Returns the width and height of the given text, drawn with the current font
+        :param text: the text to measure
+        '''
+        return Screen.render_text(self.__font, text, self.__fill_color).get_size()
 
     def line(self, x1: float, y1: float, x2: float, y2: float, weight: float) -> None:
         '''Draws a line segment on the screen
@@ -182,8 +264,8 @@ class Screen:
         :param y2: the Y coordinate for the end of the line
         '''
 
-        pg.draw.line(self.__display, self.__fill_color,
-                     (x1, y1), (x2, y2), weight)
+        self.__mark(pg.draw.line(self.__display, self.__fill_color,
+                                 (x1, y1), (x2, y2), weight))
 
     def font_size(self, size: float) -> None:
         '''Sets the size of the font used to drawing text
@@ -191,7 +273,7 @@ class Screen:
         '''
 
         self.__font_size = size
-        self.__font = pg.font.SysFont(self.__font_family, self.__font_size)
+        self.__font = Screen.load_sys_font(self.__font_family, self.__font_size)
 
     def font_family(self, name: str) -> None:
         '''Sets the font family used to drawing text
@@ -199,20 +281,49 @@ class Screen:
         '''
 
         self.__font_family = name
-        self.__font = pg.font.SysFont(self.__font_family, self.__font_size)
+        self.__font = Screen.load_sys_font(self.__font_family, self.__font_size)
 
-    def load_font(self, path: str, size: int) -> pg.font.Font:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def load_font(path: str, size: int) -> pg.font.Font:
         '''Loads a font file with a given font size,
-        using the pygame.font module
+        using the pygame.font module.
+        Fonts are shared between every screen, so each font is only loaded once
         :param path: the path to the font file
         :param size: the size of the font'''
         return pg.font.Font(path, size)
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def load_sys_font(family: str, size: int) -> pg.font.Font:
+        '''Loads a system font with a given font size,
+        shared between every screen like load_font
+        :param family: the name of the font family
+        :param size: the size of the font'''
+        return pg.font.SysFont(family, size)
+
+    @staticmethod
+    @lru_cache(maxsize=1000)
+    def render_text(font: pg.font.Font, text: str, color: tuple) -> pg.Surface:
+        '''Returns the rendered surface of the given text.
+        Most texts are the same on every frame, so the least recently used surfaces are cached
+        :param font: the font of the text
+        :param text: the text to render
+        :param color: the color of the text'''
+        return font.render(text, True, color)
+
     def set_font(self, font: pg.font.Font) -> None:
         '''Sets the font used to draw text
         :param font: the new font'''
         self.__font = font
 
+    def pop_dirty_rects(self) -> list[pg.Rect]:
+        '''Returns the regions drawn on since the last call,
+        which are the only regions that have to be updated on the display'''
+
+        rects, self.__dirty_rects = self.__dirty_rects, []
+        return rects
+
     def quit(self) -> None:
         '''Quits pygame and exits application'''
 
@@ -269,4 +380,20 @@ class Screen:
 
     @property
     def keys(self) -> dict[str, str]:
-        return self.__keys
\ No newline at end of file
+        return self.__keys
+
+    @property
+    def update_budget(self) -> float:
+        return self.__update_budget
+
+    @property
+    def render_interval(self) -> int:
+        return self.__render_interval
+
+    @update_budget.setter
+    def update_budget(self, budget: float) -> None:
+        self.__update_budget = budget
+
+    @render_interval.setter
+    def render_interval(self, interval: int) -> None:
+        self.__render_interval = max(1, interval)
\ No newline at end of file
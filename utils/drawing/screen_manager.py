@@ -1,6 +1,11 @@
+from __future__ import annotations
+from typing import Callable
+
 import pygame as pg
 from pygame.time import Clock
 
+import time
+
 from utils.drawing import Screen
 
 
@@ -10,22 +15,47 @@ class ScreenManager:
     :param width: the default width of the screen to start the application with
     :param height: the default height of the screen to start the application with
     :param fps: the framee rate in which the screen is being updated
+    :param dirty_rects: whether to only update the regions of the display that were drawn on
     '''
 
-    def __init__(self, width: int, height: int, fps: int) -> None:
+    def __init__(self, width: int, height: int, fps: int, dirty_rects: bool = False) -> None:
         pg.init()
 
         self.__display = pg.display.set_mode((width, height))
         self.__clock = Clock()
         self.__screens: dict[str, Screen] = dict()
+        self.__factories: dict[str, Callable[[], Screen]] = dict()
+        self.__build_times: dict[str, float] = dict() # Seconds it took to build each screen
         self.__screen: str = 0
         self.__fps = fps
-
-    def init_screen(self, screen: Screen, name: str) -> None:
-        '''Initializes a new Screen and stores it in a dictionary
-        :param screen: screen to be initialized
+        self.__frame = 0 # Frames since the last drawn frame
+        self.__dirty_rects = dirty_rects
+        self.__full_update = True # The whole display is updated after switching screens
+        self.__switches = 0 # Number of screen switches, used to tell which screen a frame belongs to
+
+    def init_screen(self, screen: Screen | Callable[[], Screen], name: str) -> None:
+        '''Registers a new Screen by its name.
+        Screens can be given as a factory, such as the screen class itself,
+        which is only called when the screen is set for the first time
+        :param screen: the screen or a function that builds the screen
         :param name: the name of the screen to be recognized with'''
-        self.__screens[name] = screen
+
+        if isinstance(screen, Screen):
+            self.__screens[name] = screen
+        else:
+            self.__factories[name] = screen
+
+    def get_screen(self, name: str) -> Screen:
+        '''Returns the screen with the given name, building it if it was not built yet
+        :param name: the name of the screen
+        '''
+
+        if name not in self.__screens:
+            start = time.perf_counter()
+            self.__screens[name] = self.__factories.pop(name)()
+            self.__build_times[name] = time.perf_counter() - start
+
+        return self.__screens[name]
 
     def set_screen(self, name: str, data: dict = {}) -> None:
         '''Sets the current active screen
@@ -34,13 +64,19 @@ class ScreenManager:
         '''
 
         self.__screen = name
-        screen = self.__screens[self.__screen]
+        screen = self.get_screen(self.__screen)
 
         if hasattr(screen, 'switch_reset'): screen.switch_reset()
         if hasattr(screen, 'recieve_data'): screen.recieve_data(data)
 
+        # The display shows the previous screen, the first restored background has to cover all of it
+        screen.invalidate_background()
+
         pg.display.set_mode((screen.width, screen.height))
         pg.display.set_caption(screen.title)
+        self.__full_update = True
+        self.__switches += 1
+        self.__frame = screen.render_interval - 1 # The new screen is drawn on its first frame
 
 
     def start(self) -> None:
@@ -48,22 +84,36 @@ class ScreenManager:
         :raises Exception: the application cannot be started without an initialized screen
         '''
 
-        if len(self.__screens) == 0:
+        if len(self.__screens) == 0 and len(self.__factories) == 0:
             raise Exception('A screen needs to be initialized before starting the screen manager.')
 
         while True:
             self.update()
 
     def update(self) -> None:
-        '''Updates and forwards events to the current active screen'''
+        '''Updates and forwards events to the current active screen.
+        Screens with an update budget are updated as many times as fit in the budget for each frame,
+        and screens with a render interval are only drawn once every few frames
+        '''
 
         screen = self.__screens[self.__screen]
-        
+        switches = self.__switches
+
         # Update active screen
         if hasattr(screen, 'update'):
-            screen.update()
-
-        if hasattr(screen, 'draw'):
+            if screen.update_budget is None:
+                screen.update()
+            else:
+                # Run fixed time steps untill the budget of this frame runs out
+                start = time.perf_counter()
+                screen.update()
+                while time.perf_counter() - start < screen.update_budget:
+                    screen.update()
+
+        self.__frame += 1
+        render = self.__frame >= screen.render_interval
+
+        if render and hasattr(screen, 'draw'):
             screen.draw()
     
         for event in pg.event.get():
@@ -74,7 +124,28 @@ class ScreenManager:
             if event.type == pg.USEREVENT:
                 self.set_screen(event.screen, event.data)
 
-        self.__display.blit(screen.surface, (0, 0))
+        # Skipped frames are not limited by the frame rate
+        if not render:
+            return
+
+        self.__frame = 0
+        rects = screen.pop_dirty_rects()
+
+        if self.__dirty_rects and not self.__full_update:
+            # Only copy and update the regions that were drawn on
+            for rect in rects:
+                self.__display.blit(screen.surface, rect, rect)
+            pg.display.update(rects)
+        else:
+            self.__display.blit(screen.surface, (0, 0))
+            pg.display.flip()
+
+            # A frame of the previous screen does not count, the new screen was switched to after it was drawn
+            if switches == self.__switches:
+                self.__full_update = False
+
+        self.__clock.tick(self.__fps)
 
-        pg.display.flip()
-        self.__clock.tick(self.__fps)
\ No newline at end of file
+    @property
+    def build_times(self) -> dict[str, float]:
+        return self.__build_times
\ No newline at end of file
@@ -93,7 +93,7 @@ class TextBox:
         self.__rect = pg.Rect(x, y, w, h)
         self.__color = (0, 0, 0)
         self.__text = text
-        self.__txt_surface = pg.font.SysFont('monospace', self.__default_width).render(self.__text, True, self.__color)
+        self.__txt_surface = Screen.render_text(Screen.load_sys_font('monospace', self.__default_width), self.__text, self.__color)
         self.__active = False
         self.__padding = 10
 
@@ -122,7 +122,7 @@ class TextBox:
                 if unicode.isdigit() and int(self.__text + unicode) < 10:
                     self.__text += unicode
 
-            self.__txt_surface = pg.font.SysFont('monospace', self.__default_width).render(self.__text, True, self.__color)
+            self.__txt_surface = Screen.render_text(Screen.load_sys_font('monospace', self.__default_width), self.__text, self.__color)
             self.__rect.w = max(self.__default_width, self.__txt_surface.get_width() + self.__padding * 2)
 
     def draw(self) -> None:
@@ -135,7 +135,7 @@ class TextBox:
         '''Clears all the text in the text box'''
         self.__active = False
         self.__text = ''
-        self.__txt_surface = pg.font.SysFont('monospace', self.__default_width).render(self.__text, True, self.__color)
+        self.__txt_surface = Screen.render_text(Screen.load_sys_font('monospace', self.__default_width), self.__text, self.__color)
         self.__rect.w = max(self.__default_width, self.__txt_surface.get_width() + self.__padding * 2)
 
     @property
@@ -9,17 +9,38 @@ class SpriteDimensions:
     '''This class is used to store the dimensions of each sprite in the game'''
     dimensions: dict[str, tuple[int, int]] = {}
 
+    @staticmethod
+    def load() -> None:
+        '''Loads the dimensions of every sprite from its image files without opening a window,
+        used for headless training. The game screen fills them from the images it draws
+        '''
+
+        import pygame as pg
+
+        sprites = {
+            'asteroid': [f'assets/sprites/asteroid{i}.png' for i in range(1, 4)],
+            'player': ['assets/sprites/player.png'],
+            'projectile': ['assets/sprites/projectile.png'],
+        }
+
+        for sprite, paths in sprites.items():
+            SpriteDimensions.dimensions[sprite] = [pg.image.load(path).get_size() for path in paths]
+
 class Hitbox:
     '''The hitbox class is responsible for collision detection of the different sprites
     :param pos: position of the sprite
     :param component: name of the sprite
-    :param scale: the scale of the sprite in respect to the original image size'''
+    :param scale: the scale of the sprite in respect to the original image size
+    :param rng: the random number generator picking one of the component's sprites, the global one by default'''
+
+    __slots__ = ('__pos', '__scale', '__index', '__width', '__height')
 
-    def __init__(self, pos: PositionVector, component: str, scale: float):
+    def __init__(self, pos: PositionVector, component: str, scale: float, rng: random.Random = None):
         self.__pos, self.__scale = pos, scale
 
+        # Components with a single sprite do not use random numbers
         dimensions = SpriteDimensions.dimensions[component]
-        self.__index = random.randint(0, len(dimensions) - 1)
+        self.__index = 0 if len(dimensions) == 1 else (rng or random).randint(0, len(dimensions) - 1)
 
         w, h = SpriteDimensions.dimensions[component][self.__index]
         self.__width, self.__height = int(w * scale), int(h * scale)
@@ -35,6 +56,78 @@ class Hitbox:
             and self.__pos.y - self.__height * .5 < other.pos.y + other.height * .5 \
             and self.__pos.y + self.__height * .5 > other.pos.y - other.height * .5
 
+    def sweep_collides(self, other: Hitbox, dx: float, dy: float) -> bool:
+        '''Returns wether this hitbox collides with the given hitbox at any moment of a step
+        via swept rectangular collision check, so fast hitboxes cannot pass through each other.
+        Both hitboxes are at their positions at the end of the step
+        :param other: the other hitbox to check collision with
+        :param dx: the X distance this hitbox moved during the step, relative to the other hitbox
+        :param dy: the Y distance this hitbox moved during the step, relative to the other hitbox
+        '''
+
+        # Move along the segment from the start of the step towards the other hitbox,
+        # grown by the size of this hitbox (slab test of the time both axes overlap)
+        enter, leave = 0., 1.
+        for start, delta, half in ((self.__pos.x - dx - other.pos.x, dx, (self.__width + other.width) * .5),
+                                   (self.__pos.y - dy - other.pos.y, dy, (self.__height + other.height) * .5)):
+            if delta == 0:
+                if not -half < start < half:
+                    return False
+                continue
+
+            t1, t2 = (-half - start) / delta, (half - start) / delta
+            if t1 > t2:
+                t1, t2 = t2, t1
+
+            enter, leave = max(enter, t1), min(leave, t2)
+            if enter >= leave:
+                return False
+
+        return True
+
+    @staticmethod
+    def colliding_pairs(first: list[Hitbox], second: list[Hitbox]) -> list[tuple[int, int]]:
+        '''Returns the index pairs of every colliding hitbox in the first list with a hitbox in the second list,
+        checking every possible pair
+        :param first: the first list of hitboxes
+        :param second: the second list of hitboxes
+        '''
+
+        return [(i, j) for i, a in enumerate(first) for j, b in enumerate(second) if a.collides(b)]
+
+    @staticmethod
+    def sweep_and_prune(first: list[Hitbox], second: list[Hitbox]) -> list[tuple[int, int]]:
+        '''Returns the index pairs of every colliding hitbox in the first list with a hitbox in the second list.
+        The hitboxes are sorted by their left edge and swept along the X axis,
+        so only pairs with overlapping X intervals are fully checked
+        :param first: the first list of hitboxes
+        :param second: the second list of hitboxes
+        '''
+
+        # (left, right, list number, index) of each hitbox, sorted by the left edge
+        intervals = [(b.pos.x - b.width * .5, b.pos.x + b.width * .5, 0, i) for i, b in enumerate(first)]
+        intervals += [(b.pos.x - b.width * .5, b.pos.x + b.width * .5, 1, i) for i, b in enumerate(second)]
+        intervals.sort(key=lambda interval: interval[0])
+
+        hitboxes = (first, second)
+        active: tuple[list[tuple[float, int]], list[tuple[float, int]]] = ([], []) # (right, index) of each list
+        pairs = []
+
+        for left, right, group, index in intervals:
+            other = 1 - group
+
+            # Drop intervals which end before this one starts
+            active[other][:] = [item for item in active[other] if item[0] > left]
+
+            hitbox = hitboxes[group][index]
+            for _, other_index in active[other]:
+                if hitbox.collides(hitboxes[other][other_index]):
+                    pairs.append((index, other_index) if group == 0 else (other_index, index))
+
+            active[group].append((right, index))
+
+        return pairs
+
     @property
     def rect_verts(self) -> list[tuple[float, float]]:
         return [
@@ -74,4 +167,58 @@ class Hitbox:
 
     @scale.setter
     def scale(self, scale: float) -> None:
-        self.__scale = scale
\ No newline at end of file
+        self.__scale = scale
+
+
+class SweptHitbox:
+    '''The area a hitbox moved through during a step, used to find what a fast sprite might have hit
+    with the same broad phases as a regular hitbox
+    :param hitbox: the hitbox at the end of the step
+    :param dx: the X distance the hitbox moved during the step
+    :param dy: the Y distance the hitbox moved during the step
+    :param margin: extra distance on each side, for the movement of the hitboxes it is tested against
+    '''
+
+    __slots__ = ('__hitbox', '__dx', '__dy', '__pos', '__width', '__height')
+
+    def __init__(self, hitbox: Hitbox, dx: float, dy: float, margin: float = 0) -> None:
+        self.__hitbox, self.__dx, self.__dy = hitbox, dx, dy
+
+        # Box around the start and the end of the movement
+        self.__pos = PositionVector(hitbox.pos.x - dx * .5, hitbox.pos.y - dy * .5)
+        self.__width = hitbox.width + abs(dx) + margin * 2
+        self.__height = hitbox.height + abs(dy) + margin * 2
+
+    def collides(self, other: Hitbox) -> bool:
+        '''Returns wether the area collides with the given hitbox,
+        the hitbox might still have been missed
+        :param other: the other hitbox to check collision with'''
+
+        return self.__pos.x - self.__width * .5 < other.pos.x + other.width * .5 \
+            and self.__pos.x + self.__width * .5 > other.pos.x - other.width * .5 \
+            and self.__pos.y - self.__height * .5 < other.pos.y + other.height * .5 \
+            and self.__pos.y + self.__height * .5 > other.pos.y - other.height * .5
+
+    def hits(self, other: Hitbox, dx: float = 0, dy: float = 0) -> bool:
+        '''Returns wether the moving hitbox collided with the given hitbox during the step
+        :param other: the other hitbox to check collision with
+        :param dx: the X distance the other hitbox moved during the step
+        :param dy: the Y distance the other hitbox moved during the step
+        '''
+        return self.__hitbox.sweep_collides(other, self.__dx - dx, self.__dy - dy)
+
+    @property
+    def hitbox(self) -> Hitbox:
+        return self.__hitbox
+
+    @property
+    def width(self) -> float:
+        return self.__width
+
+    @property
+    def height(self) -> float:
+        return self.__height
+
+    @property
+    def pos(self) -> PositionVector:
+        return self.__pos
\ No newline at end of file
@@ -2,35 +2,78 @@ from __future__ import annotations
 
 from utils.geometry.vector import PositionVector, DirectionVector
 from utils.geometry.collision import Hitbox
+from utils.geometry.spatial_grid import SpatialGrid
 from utils.constants import Constants
 from components.asteroid import Asteroid
 
+from functools import lru_cache
 import math
 
 
+@lru_cache(maxsize=None)
+def direction_table(offset: float, step: float) -> tuple[tuple[float, float, float], ...]:
+    '''Returns the (angle, cosine, sine) of every turn step in a full revolution,
+    starting from the given offset angle. The table is shared by every ray with the same offset,
+    returns an empty table if the step does not divide a full revolution
+    :param offset: the starting angle of the table, measured in radians
+    :param step: the angle of a single turn step, measured in radians
+    '''
+
+    steps = round(math.tau / step)
+    if steps == 0 or not math.isclose(steps * step, math.tau):
+        return ()
+
+    angles = (offset + step * i for i in range(steps))
+    return tuple((angle, math.cos(angle), math.sin(angle)) for angle in angles)
+
+
 class Ray:
     '''A geometrical Ray with a given positon and angle
     :pos: position of the ray
     :angle: angle of the ray
+    :step: the angle of a single turn step, used to look up the direction of the ray when turning
     '''
 
-    def __init__(self, pos: PositionVector, angle: float) -> None:
+    __slots__ = ('__pos', '__angle', '__dir', '__intersection',
+                 '__looped', '__looped_pos', '__projection_end', '__hit',
+                 '__projected', '__has_projection', '__step', '__table', '__table_index')
+
+    def __init__(self, pos: PositionVector, angle: float, step: float = Constants.PLAYER_TURN_SPEED) -> None:
         self.__pos = pos
         self.__angle = angle
         self.__dir = DirectionVector(Constants.WINDOW_DIAGONAL, self.__angle)
         self.__intersection = None
 
         self.__looped = False
-        self.__looped_pos: PositionVector = None
-        self.__projection_end: PositionVector = None
+        self.__looped_pos = PositionVector()
+        self.__projection_end = PositionVector()
         self.__hit: Asteroid = None
-        self.update()
+
+        # The projection on the screen edges is only calculated when it is needed
+        self.__projected = False
+        self.__has_projection = False
+
+        # Precomputed directions for turning
+        self.__step = step
+        self.__table = direction_table(angle, step)
+        self.__table_index = 0
 
     def __iter__(self) -> iter:
         return iter((*self.__pos, *self.end))
 
     def update(self) -> None:
-        '''Updates the ray's looped position and projection end'''
+        '''Marks the ray's looped position and projection end as outdated,
+        called whenever the ray moves or turns
+        '''
+        self.__projected = False
+
+    def project(self) -> None:
+        '''Calculates the ray's looped position and projection end, if they are outdated'''
+
+        if self.__projected:
+            return
+        self.__projected = True
+        self.__has_projection = True
 
         m = self.__dir.y / self.__dir.x # m = (y2 - y1) / (x2 - x1)
         b = self.__pos.y - m * self.__pos.x # b = y - mx
@@ -53,7 +96,7 @@ class Ray:
             return
 
         # No projection and looped points
-        self.__projection_end, self.__looped_pos = None, None
+        self.__has_projection = False
     
     def check_bottom_intersection(self, m: float, b: float) -> bool:
         '''Checks for intersection with the bottom of the screen,
@@ -66,8 +109,8 @@ class Ray:
         x = (Constants.WINDOW_HEIGHT - b) / m # Substitute Y = height
         if 0 < x < Constants.WINDOW_WIDTH: # Check if point is inside the screen
             # Update projection end and looped position accordingly
-            self.__projection_end = PositionVector(x, Constants.WINDOW_HEIGHT)
-            self.__looped_pos = PositionVector(x, 0)
+            self.__projection_end.set(x, Constants.WINDOW_HEIGHT)
+            self.__looped_pos.set(x, 0)
             return True
         return False
 
@@ -82,8 +125,8 @@ class Ray:
         x = -b / m # Substitute Y = 0
         if 0 < x < Constants.WINDOW_WIDTH: # Check if point is inside the screen
             # Update projection end and looped position accordingly
-            self.__projection_end = PositionVector(x, 0)
-            self.__looped_pos = PositionVector(x, Constants.WINDOW_HEIGHT)
+            self.__projection_end.set(x, 0)
+            self.__looped_pos.set(x, Constants.WINDOW_HEIGHT)
             return True
         return False
 
@@ -98,8 +141,8 @@ class Ray:
         y = m * Constants.WINDOW_WIDTH + b # Substitute X = width
         if 0 < y < Constants.WINDOW_HEIGHT: # Check if point is inside the screen
             # Update projection end and looped position accordingly
-            self.__projection_end = PositionVector(Constants.WINDOW_WIDTH, y)
-            self.__looped_pos = PositionVector(0, y)
+            self.__projection_end.set(Constants.WINDOW_WIDTH, y)
+            self.__looped_pos.set(0, y)
             return True
         return False
 
@@ -114,8 +157,8 @@ class Ray:
         y = b # Substitute X = 0
         if 0 < y < Constants.WINDOW_HEIGHT: # Check if point is inside the screen
             # Update projection end and looped position accordingly
-            self.__projection_end = PositionVector(0, y)
-            self.__looped_pos = PositionVector(Constants.WINDOW_WIDTH, y)
+            self.__projection_end.set(0, y)
+            self.__looped_pos.set(Constants.WINDOW_WIDTH, y)
             return True
         return False
 
@@ -128,7 +171,7 @@ class Ray:
         '''
 
         # Use the looped position if looped is True
-        start_pos = self.__looped_pos if looped else self.__pos
+        start_pos = self.looped_pos if looped else self.__pos
 
         # Better notation
         x1, y1 = pos1
@@ -167,7 +210,7 @@ class Ray:
         closest_dist = 0
 
         # Use the looped positon if looped is True
-        start_pos = self.__looped_pos if looped else self.__pos
+        start_pos = self.looped_pos if looped else self.__pos
 
         # Iterate through every polygon segment
         verts = hitbox.rect_verts
@@ -188,19 +231,43 @@ class Ray:
         
         return closest
 
-    def intersects_asteroids(self, asteroids: list[Asteroid], looped: bool = False) -> PositionVector:
+    def intersects_asteroids(self, asteroids: list[Asteroid], looped: bool = False, grid: SpatialGrid = None) -> PositionVector:
         '''Returns the intersection point of the ray with closest asteroid in the list,
         returns None if there is no intersection
         :param asteroids: list of the asteroids
         :looped: whether or not to use the looped version of the ray
+        :param grid: spatial grid holding the asteroids, used to only check the asteroids along the ray
         '''
-        
-        # Seek for closest intersection
-        closest = None
-        closest_dist = 0
 
         # Use the looped position if looped is True
-        start_pos = self.__looped_pos if looped else self.__pos
+        start_pos = self.looped_pos if looped else self.__pos
+
+        if grid is None or not grid.contains(*start_pos):
+            closest, _, hit = self.closest_intersection(asteroids, start_pos, looped)
+        else:
+            closest, hit = self.closest_intersection_in_grid(grid, start_pos, looped)
+
+        # If looped is True and there is an intersection
+        # set the ray as a looped ray
+        self.__looped = looped and closest
+        self.__intersection = closest # Update intersection point
+        # Set the asteroid that the ray intersects with
+        self.__hit = hit
+        return closest
+
+    def closest_intersection(self, asteroids: list[Asteroid], start_pos: PositionVector, looped: bool,
+                             closest: PositionVector = None, closest_dist: float = 0,
+                             hit: Asteroid = None) -> tuple[PositionVector, float, Asteroid]:
+        '''Returns the closest intersection point of the ray with the given asteroids,
+        its distance from the ray origin and the asteroid that was hit.
+        A previous closest intersection can be given to continue the search from
+        :param asteroids: list of the asteroids
+        :param start_pos: the origin of the ray
+        :looped: whether or not to use the looped version of the ray
+        :param closest: the closest intersection point found so far
+        :param closest_dist: the distance of the closest intersection point found so far
+        :param hit: the asteroid of the closest intersection point found so far
+        '''
 
         # Iterate through every asteroid
         for asteroid in asteroids:
@@ -213,14 +280,36 @@ class Ray:
                 if dist < closest_dist or closest is None:
                     closest = point
                     closest_dist = dist
+                    hit = asteroid
 
-        # If looped is True and there is an intersection
-        # set the ray as a looped ray
-        self.__looped = looped and closest
-        self.__intersection = closest # Update intersection point
-        # Set the asteroid that the ray intersects with
-        self.__hit = asteroid if closest else None
-        return closest
+        return closest, closest_dist, hit
+
+    def closest_intersection_in_grid(self, grid: SpatialGrid, start_pos: PositionVector,
+                                     looped: bool) -> tuple[PositionVector, Asteroid]:
+        '''Returns the closest intersection point of the ray with the asteroids in the grid
+        and the asteroid that was hit, only checking the cells along the ray
+        :param grid: spatial grid holding the asteroids
+        :param start_pos: the origin of the ray, must be inside the world
+        :looped: whether or not to use the looped version of the ray
+        '''
+
+        closest, closest_dist, hit = None, 0, None
+        checked: set[Asteroid] = set() # Asteroids can cover multiple cells
+
+        mag = self.__dir.mag
+        for cell, exit_dist in grid.traverse(start_pos.x, start_pos.y, self.__dir.x / mag, self.__dir.y / mag):
+            unchecked = [asteroid for asteroid in cell if asteroid not in checked]
+            checked.update(unchecked)
+            closest, closest_dist, hit = self.closest_intersection(unchecked, start_pos, looped, closest, closest_dist, hit)
+
+            # Every asteroid in the next cells is further than the closest intersection
+            if closest is not None and closest_dist <= exit_dist:
+                return closest, hit
+
+        # The ray left the world, check the asteroids outside of it
+        unchecked = [asteroid for asteroid in grid.outside if asteroid not in checked]
+        closest, closest_dist, hit = self.closest_intersection(unchecked, start_pos, looped, closest, closest_dist, hit)
+        return closest, hit
 
     def rotate(self, angle: float) -> None:
         '''Rotates the ray by a given angle
@@ -228,6 +317,21 @@ class Ray:
         '''
 
         self.__dir.angle += angle
+        self.__table = () # The direction no longer matches the turn table
+        self.update()
+
+    def turn(self, steps: int) -> None:
+        '''Turns the ray by a whole number of turn steps,
+        using the precomputed direction table when possible
+        :param steps: the number of turn steps, negative for clockwize
+        '''
+
+        if not self.__table:
+            self.rotate(self.__step * steps)
+            return
+
+        self.__table_index = (self.__table_index + steps) % len(self.__table)
+        self.__dir.set_angle(*self.__table[self.__table_index])
         self.update()
 
     @property
@@ -240,12 +344,16 @@ class Ray:
 
     @property
     def end(self) -> PositionVector:
-        infinite_end = self.__projection_end or self.__pos + self.__dir
-        return self.__intersection or infinite_end
+        if self.__intersection:
+            return self.__intersection
+
+        self.project()
+        return self.__projection_end if self.__has_projection else self.__pos + self.__dir
 
     @property
     def looped(self) -> tuple[float, float, float, float]:
-        return (*self.__looped_pos, *(self.__intersection or self.__looped_pos + self.__dir))
+        looped_pos = self.looped_pos
+        return (*looped_pos, *(self.__intersection or looped_pos + self.__dir))
     
     @property
     def infinite(self) -> tuple[float, float, float, float]:
@@ -253,15 +361,21 @@ class Ray:
 
     @property
     def is_looped(self) -> PositionVector:
-        return self.__looped and self.__looped_pos
+        return self.__looped and self.looped_pos
 
     @property
     def looped_pos(self) -> PositionVector:
-        return self.__looped_pos
+        self.project()
+        return self.__looped_pos if self.__has_projection else None
+
+    @property
+    def projection_end(self) -> PositionVector:
+        self.project()
+        return self.__projection_end if self.__has_projection else None
 
     @property
     def length(self) -> float:
-        return self.__pos.distance(self.__projection_end)
+        return self.__pos.distance(self.projection_end)
     
     @property
     def hit(self) -> Asteroid:
@@ -282,21 +396,28 @@ class RaySet:
     :param pos: origin position of the ray set
     :angle: offset angle of the ray set
     :amount: the amount of rays in the ray set
+    :step: the angle of a single turn step of the rays
     '''
 
-    def __init__(self, pos: PositionVector, angle: float, amount: int) -> None:
+    def __init__(self, pos: PositionVector, angle: float, amount: int, step: float = Constants.PLAYER_TURN_SPEED) -> None:
         self.__pos = pos
 
         angle_gap = math.pi * 2 / amount
-        self.__rays = [Ray(self.__pos, angle + angle_gap * i) for i in range(amount)]
+        self.__rays = [Ray(self.__pos, angle + angle_gap * i, step) for i in range(amount)]
 
     def __iter__(self):
         return iter(self.__rays)
 
-    def cast(self, asteroids: list[Asteroid]) -> list[float]:
+    def __len__(self) -> int:
+        return len(self.__rays)
+
+    def cast(self, asteroids: list[Asteroid], grid: SpatialGrid = None, legacy_hits: bool = False) -> list[float]:
         '''Casts each ray in ray set on the environment,
         Results processed into the inputs of the neural network
         :param asteroids: list of asteroids on the screen
+        :param grid: spatial grid holding the asteroids, used to speed up the casting
+        :param legacy_hits: whether to take the redshift from the last asteroid in the list instead of the hit one,
+        like the older vision which pre-trained networks expect
         :returns: list of distances and redshift values of the asteroids
         '''
 
@@ -309,7 +430,7 @@ class RaySet:
             dist = 0
 
             # Check for intersection with asteroids
-            point = ray.intersects_asteroids(asteroids)
+            point = ray.intersects_asteroids(asteroids, grid=grid)
             if point:
                 # Calculate distance and set hit to True
                 dist = ray.pos.distance(point)
@@ -317,7 +438,7 @@ class RaySet:
 
             elif ray.looped_pos: # Else check if ray has a looped position
                 # Check for intersection with looped ray
-                point = ray.intersects_asteroids(asteroids, looped=True)
+                point = ray.intersects_asteroids(asteroids, looped=True, grid=grid)
                 if point:
                     # Calculate distance and set hit to True
                     dist = ray.looped_pos.distance(point) + ray.length
@@ -325,13 +446,19 @@ class RaySet:
 
             if hit: # If there is an intersection
                 # Calculate the cosine of the deviation angle using the dot product
-                redshift = (ray.dir.dot(ray.hit.velocity)) / (ray.dir.mag * ray.hit.velocity.mag)
+                velocity = asteroids[-1].velocity if legacy_hits else ray.hit.velocity
+                redshift = (ray.dir.dot(velocity)) / (ray.dir.mag * velocity.mag)
                 # Normalize distance and append it with the redshift value
                 vision.extend((1 / dist, redshift))
             else: vision.extend((0, 0)) # Zero if there is no intersection
 
         return vision
 
+    def update(self) -> None:
+        '''Updates every ray in the ray set after its origin has moved in place'''
+        for ray in self.__rays:
+            ray.update()
+
     def rotate(self, angle: float) -> None:
         '''Rotates every ray in the ray set by a given angle
         :param angle: angle to rotate by, measured in radians
@@ -340,6 +467,14 @@ class RaySet:
         for ray in self.__rays:
             ray.rotate(angle)
 
+    def turn(self, steps: int) -> None:
+        '''Turns every ray in the ray set by a whole number of turn steps
+        :param steps: the number of turn steps, negative for clockwize
+        '''
+
+        for ray in self.__rays:
+            ray.turn(steps)
+
     @property
     def pos(self) -> PositionVector:
         return self.__pos
@@ -0,0 +1,169 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from components.asteroid import Asteroid
+    from utils.geometry.collision import Hitbox
+
+from utils.constants import Constants
+
+import math
+
+
+class SpatialGrid:
+    '''Uniform grid over the game world, used to find the asteroids near a hitbox or a ray
+    without checking every asteroid in the game.
+    Hitboxes that reach outside of the world are clamped into the edge cells,
+    and are also kept in a separate list for rays that leave the world
+    :param width: the width of the world
+    :param height: the height of the world
+    :param cell_size: the width and height of a single cell
+    '''
+
+    __slots__ = ('__cell_size', '__cols', '__rows', '__width', '__height',
+                 '__cells', '__cells_of', '__outside')
+
+    def __init__(self, width: int = Constants.WINDOW_WIDTH, height: int = Constants.WINDOW_HEIGHT,
+                 cell_size: int = Constants.GRID_CELL_SIZE) -> None:
+        self.__cell_size = cell_size
+        self.__width, self.__height = width, height
+        self.__cols = math.ceil(width / cell_size)
+        self.__rows = math.ceil(height / cell_size)
+
+        self.__cells: list[list[Asteroid]] = [[] for _ in range(self.__cols * self.__rows)]
+        self.__cells_of: dict[Asteroid, list[int]] = {} # Cell indices of each asteroid
+        self.__outside: list[Asteroid] = [] # Asteroids reaching outside of the world
+
+    def __len__(self) -> int:
+        return len(self.__cells_of)
+
+    def cell_range(self, hitbox: Hitbox) -> tuple[int, int, int, int]:
+        '''Returns the first and last column and row covered by the given hitbox,
+        clamped to the edges of the grid
+        :param hitbox: the hitbox to get the cells of
+        '''
+
+        half_w, half_h = hitbox.width * .5, hitbox.height * .5
+        x, y = hitbox.pos.x, hitbox.pos.y
+        size = self.__cell_size
+
+        first_col = min(max(int((x - half_w) // size), 0), self.__cols - 1)
+        last_col = min(max(int((x + half_w) // size), 0), self.__cols - 1)
+        first_row = min(max(int((y - half_h) // size), 0), self.__rows - 1)
+        last_row = min(max(int((y + half_h) // size), 0), self.__rows - 1)
+
+        return first_col, last_col, first_row, last_row
+
+    def insert(self, asteroid: Asteroid) -> None:
+        '''Adds the given asteroid to every cell its hitbox covers
+        :param asteroid: the asteroid to add
+        '''
+
+        hitbox = asteroid.hitbox
+        first_col, last_col, first_row, last_row = self.cell_range(hitbox)
+
+        indices = []
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                index = row * self.__cols + col
+                self.__cells[index].append(asteroid)
+                indices.append(index)
+        self.__cells_of[asteroid] = indices
+
+        # Check whether the hitbox reaches outside of the world
+        half_w, half_h = hitbox.width * .5, hitbox.height * .5
+        if hitbox.pos.x - half_w < 0 or hitbox.pos.x + half_w > self.__width \
+            or hitbox.pos.y - half_h < 0 or hitbox.pos.y + half_h > self.__height:
+            self.__outside.append(asteroid)
+
+    def remove(self, asteroid: Asteroid) -> None:
+        '''Removes the given asteroid from the grid
+        :param asteroid: the asteroid to remove
+        '''
+
+        for index in self.__cells_of.pop(asteroid):
+            self.__cells[index].remove(asteroid)
+
+        if asteroid in self.__outside:
+            self.__outside.remove(asteroid)
+
+    def clear(self) -> None:
+        '''Removes every asteroid from the grid'''
+        for cell in self.__cells:
+            cell.clear()
+        self.__cells_of.clear()
+        self.__outside.clear()
+
+    def rebuild(self, asteroids: list[Asteroid]) -> None:
+        '''Clears the grid and adds the given asteroids to it
+        :param asteroids: the asteroids to add
+        '''
+
+        self.clear()
+        for asteroid in asteroids:
+            self.insert(asteroid)
+
+    def query(self, hitbox: Hitbox) -> list[Asteroid]:
+        '''Returns every asteroid which shares a cell with the given hitbox,
+        these are the only asteroids that can collide with it
+        :param hitbox: the hitbox to look around
+        '''
+
+        first_col, last_col, first_row, last_row = self.cell_range(hitbox)
+
+        # Single cell, no duplicates are possible
+        if first_col == last_col and first_row == last_row:
+            return self.__cells[first_row * self.__cols + first_col].copy()
+
+        found: dict[Asteroid, None] = {} # Ordered set
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                found.update(dict.fromkeys(self.__cells[row * self.__cols + col]))
+        return list(found)
+
+    def traverse(self, x: float, y: float, dx: float, dy: float) -> Iterator[tuple[list[Asteroid], float]]:
+        '''Walks through the cells along a ray in order using grid traversal (DDA),
+        yields the asteroids of each cell and the distance at which the ray leaves the cell
+        :param x: the X coordinate of the ray origin, must be inside the world
+        :param y: the Y coordinate of the ray origin, must be inside the world
+        :param dx: the X component of the ray's unit direction
+        :param dy: the Y component of the ray's unit direction
+        '''
+
+        size = self.__cell_size
+        col = min(int(x // size), self.__cols - 1)
+        row = min(int(y // size), self.__rows - 1)
+
+        step_col = 1 if dx > 0 else -1
+        step_row = 1 if dy > 0 else -1
+
+        # Distance along the ray to the next vertical and horizontal cell borders
+        next_x = ((col + 1) * size - x) / dx if dx > 0 else (col * size - x) / dx if dx < 0 else math.inf
+        next_y = ((row + 1) * size - y) / dy if dy > 0 else (row * size - y) / dy if dy < 0 else math.inf
+        delta_x = size / abs(dx) if dx != 0 else math.inf
+        delta_y = size / abs(dy) if dy != 0 else math.inf
+
+        while 0 <= col < self.__cols and 0 <= row < self.__rows:
+            if next_x < next_y:
+                yield self.__cells[row * self.__cols + col], next_x
+                col += step_col
+                next_x += delta_x
+            else:
+                yield self.__cells[row * self.__cols + col], next_y
+                row += step_row
+                next_y += delta_y
+
+    def contains(self, x: float, y: float) -> bool:
+        '''Returns whether the given point is inside the world
+        :param x: the X coordinate of the point
+        :param y: the Y coordinate of the point
+        '''
+        return 0 <= x <= self.__width and 0 <= y <= self.__height
+
+    @property
+    def outside(self) -> list[Asteroid]:
+        return self.__outside
+
+    @property
+    def cell_size(self) -> int:
+        return self.__cell_size
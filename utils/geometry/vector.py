@@ -17,24 +17,59 @@ class PositionVector:
     :param y: The Y component of the position vector
     '''
 
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: float = 0, y: float = 0):
-        self.__x = x
-        self.__y = y
+        self.x = x
+        self.y = y
 
     def __add__(self, other: PositionVector | DirectionVector) -> PositionVector:
-        return PositionVector(self.__x + other.x, self.__y + other.y)
+        return PositionVector(self.x + other.x, self.y + other.y)
 
     def __sub__(self, other: PositionVector | DirectionVector) -> PositionVector:
-        return PositionVector(self.__x - other.x, self.__y - other.y)
+        return PositionVector(self.x - other.x, self.y - other.y)
 
     def __mul__(self, other: PositionVector | DirectionVector) -> PositionVector:
-        return PositionVector(self.__x * other.x, self.__y * other.y)
+        return PositionVector(self.x * other.x, self.y * other.y)
+
+    def __iadd__(self, other: PositionVector | DirectionVector) -> PositionVector:
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other: PositionVector | DirectionVector) -> PositionVector:
+        self.x -= other.x
+        self.y -= other.y
+        return self
 
     def __iter__(self) -> iter:
-        return iter((self.__x, self.__y))
+        return iter((self.x, self.y))
+
+    def add_scaled(self, other: PositionVector | DirectionVector, scale: float) -> PositionVector:
+        '''Adds the given vector multiplied by a scalar to this vector in place,
+        returns this vector to allow chaining
+        :param other: the vector to add
+        :param scale: the scalar to multiply the added vector by
+        '''
+
+        self.x += other.x * scale
+        self.y += other.y * scale
+        return self
+
+    def set(self, x: float, y: float) -> PositionVector:
+        '''Sets both components of this vector in place,
+        returns this vector to allow chaining
+        :param x: the new X component
+        :param y: the new Y component
+        '''
+
+        self.x = x
+        self.y = y
+        return self
 
     def handle_offscreen(self, sprite: Hitbox = None) -> None:
-        '''Loops the vector through the edges of the screen if it is offscreen
+        '''Loops the vector through the edges of the screen if it is offscreen,
+        the vector is wrapped in place
         :param sprite: The hitbox for the looped sprite
         '''
 
@@ -42,20 +77,20 @@ class PositionVector:
         height = sprite.height if sprite else 0
 
         # left to right
-        if self.__x + width * .5 < 0:
-            self.__x = Constants.WINDOW_WIDTH + width * .5
+        if self.x + width * .5 < 0:
+            self.x = Constants.WINDOW_WIDTH + width * .5
 
         # right to left
-        elif self.__x - width * .5 > Constants.WINDOW_WIDTH:
-            self.__x = -width * .5
+        elif self.x - width * .5 > Constants.WINDOW_WIDTH:
+            self.x = -width * .5
 
         # bottom to top
-        elif self.__y + height * .5 < 0:
-            self.__y = Constants.WINDOW_HEIGHT + height * .5
+        elif self.y + height * .5 < 0:
+            self.y = Constants.WINDOW_HEIGHT + height * .5
 
         # top to bottom
-        elif self.__y - height * .5 > Constants.WINDOW_HEIGHT:
-            self.__y = -height * .5
+        elif self.y - height * .5 > Constants.WINDOW_HEIGHT:
+            self.y = -height * .5
 
     def distance(self, other: PositionVector) -> float:
         '''Returns the distance between this postion and a given position
@@ -76,23 +111,7 @@ class PositionVector:
 
     def copy(self) -> PositionVector:
         '''Returns a copy of this vector'''
-        return PositionVector(self.__x, self.__y)
-
-    @property
-    def x(self) -> float:
-        return self.__x
-
-    @property
-    def y(self) -> float:
-        return self.__y
-
-    @x.setter
-    def x(self, x: float) -> None:
-        self.__x = x
-
-    @y.setter
-    def y(self, y: float) -> None:
-        self.__y = y
+        return PositionVector(self.x, self.y)
 
 class DirectionVector:
     '''Geometric vector used for directions
@@ -100,6 +119,8 @@ class DirectionVector:
     :param angle: angle of the vector, measured in radians
     '''
 
+    __slots__ = ('__mag', '__angle', '__x', '__y')
+
     def __init__(self, mag: float, angle: float) -> None:
         self.__mag = mag
         self.__angle = angle
@@ -122,6 +143,17 @@ class DirectionVector:
         self.__mag = (1 - step) * self.__mag + step * to
         self.__update_components()
 
+    def set_angle(self, angle: float, cos: float, sin: float) -> None:
+        '''Sets the angle of the vector using its precomputed cosine and sine
+        :param angle: the new angle, measured in radians
+        :param cos: the cosine of the new angle
+        :param sin: the sine of the new angle
+        '''
+
+        self.__angle = angle
+        self.__x = cos * self.__mag
+        self.__y = sin * self.__mag
+
     def dot(self, other: PositionVector | DirectionVector) -> float:
         '''Returns the dot product of this vector with a given vector
         :param other: second vector.
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import random
+
+
+class RandomState:
+    '''The state of a random number generator, owned by a single object.
+    Code running inside a with block on this state uses it in place of the global state of the random module,
+    so the random numbers of the owner do not depend on any other code running in the same thread
+    :param seed: the seed of the state, None seeds it from the system like the random module
+    '''
+
+    def __init__(self, seed: int | str = None) -> None:
+        self.__state = random.Random(seed).getstate()
+        self.__outer_state: tuple = None
+
+    def __enter__(self) -> RandomState:
+        self.__outer_state = random.getstate()
+        random.setstate(self.__state)
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.__state = random.getstate()
+        random.setstate(self.__outer_state)